@@ -10,6 +10,9 @@ class ApiKey(models.Model):
     # Billing
     price_per_million_chars = fields.FloatField(default=15.0) # $15 per 1M chars default
 
+    # Scheduling: relative share of inference slots under contention
+    weight = fields.FloatField(default=1.0)
+
 class UsageLog(models.Model):
     id = fields.IntField(pk=True)
     api_key = fields.ForeignKeyField('models.ApiKey', related_name='usage_logs')
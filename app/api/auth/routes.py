@@ -16,6 +16,7 @@ router = APIRouter()
 async def create_api_key(
     name: Optional[str] = Query(default=None, description="Client name"),
     price: float = Query(default=15.0, description="Price per million chars"),
+    weight: float = Query(default=1.0, gt=0, description="Fair-share scheduling weight"),
     body: Optional[dict] = Body(default=None),
 ):
     """Admin endpoint to create keys (unprotected for demo, protect in prod!)"""
@@ -25,6 +26,8 @@ async def create_api_key(
             name = body.get("name")
             if body.get("price") is not None:
                 price = float(body["price"])
+            if body.get("weight") is not None:
+                weight = float(body["weight"])
         if not name:
             raise HTTPException(status_code=400, detail="Name is required (query param or JSON body)")
 
@@ -33,12 +36,14 @@ async def create_api_key(
             key=key_str,
             name=name,
             price_per_million_chars=price,
+            weight=weight,
         )
         return {
             "name": name,
             "api": key_str,
             "api_key": str(api_key.id),
             "rate": f"${price}/1M chars",
+            "weight": weight,
         }
     except IntegrityError as e:
         logger.error(f"Integrity Error creating API Key: {e}")
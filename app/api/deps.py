@@ -1,10 +1,41 @@
 """FastAPI dependencies for auth and common logic."""
+import asyncio
+from typing import Optional
 
 from fastapi import Depends, Request
 from app.api.auth.models import ApiKey
-from app.core.database import verify_api_key, AuthError
+from app.core.config import settings
+from app.core.database import verify_api_key, AuthError, track_usage
+from app.core.logging import logger
+from app.services.ort_session import INT8_SUFFIX
 
 
 async def get_api_key(request: Request) -> ApiKey:
     """FastAPI dependency that verifies the Bearer token and returns the ApiKey."""
     return await verify_api_key(request)
+
+
+def resolve_model_version(model: str):
+    """Model version for an API model name (None = default).
+
+    A "-int8" suffix selects the INT8-quantized variant, e.g. "v2-int8".
+    """
+    if model.endswith(INT8_SUFFIX):
+        base = resolve_model_version(model.removesuffix(INT8_SUFFIX)) or settings.DEFAULT_MODEL_VERSION
+        return base.removesuffix(INT8_SUFFIX) + INT8_SUFFIX
+    if model in ["tts-2", "tts-2-hd", "supertonic-v2"]:
+        return "v2"
+    return None
+
+
+def resolve_steps(model: str, steps: Optional[int] = None) -> int:
+    """Denoising steps for a request: its override, else the model's quality tier."""
+    tier = model.removesuffix(INT8_SUFFIX)
+    return steps or settings.QUALITY_TIERS.get(tier, settings.DENOISING_STEPS)
+
+
+def bill(api_key: ApiKey, char_count: int):
+    """Calculate and track usage in the background."""
+    cost = (char_count / 1_000_000) * api_key.price_per_million_chars
+    asyncio.create_task(track_usage(api_key, char_count, cost))
+    logger.info(f"Queued billing for {api_key.name}: {char_count} chars, ${cost:.6f}")
@@ -0,0 +1,32 @@
+from tortoise import fields, models
+
+class SpeechJob(models.Model):
+    id = fields.UUIDField(pk=True)
+    api_key = fields.ForeignKeyField('models.ApiKey', related_name='speech_jobs')
+    status = fields.CharField(max_length=16, default="queued", index=True) # queued, running, completed, failed, cancelled
+
+    # Request
+    text = fields.TextField()
+    model_version = fields.CharField(max_length=16, null=True)
+    voice = fields.CharField(max_length=64)
+    speed = fields.FloatField(default=1.0)
+    response_format = fields.CharField(max_length=8)
+    max_chunk_length = fields.IntField()
+    steps = fields.IntField(null=True)  # Denoising steps (null = DENOISING_STEPS)
+
+    # Progress: chunks done and bytes of PCM spooled for them, so a restart
+    # resumes from the last finished chunk
+    total_chunks = fields.IntField(default=0)
+    completed_chunks = fields.IntField(default=0)
+    spooled_bytes = fields.BigIntField(default=0)
+    sample_rate = fields.IntField(null=True)
+    error = fields.TextField(null=True)
+
+    # Runner that claimed the job while running; it renews the lease as it
+    # works, and a lapsed lease lets another server process take the job over
+    owner = fields.CharField(max_length=64, null=True)
+    lease_expires_at = fields.DatetimeField(null=True)
+
+    created_at = fields.DatetimeField(auto_now_add=True)
+    updated_at = fields.DatetimeField(auto_now=True)
+    finished_at = fields.DatetimeField(null=True)
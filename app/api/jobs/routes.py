@@ -0,0 +1,110 @@
+import os
+from uuid import UUID
+from fastapi import APIRouter, Depends, HTTPException
+from fastapi.responses import FileResponse
+
+from app.api.auth.models import ApiKey
+from app.api.deps import bill, get_api_key, resolve_model_version, resolve_steps
+from app.api.jobs.models import SpeechJob
+from app.api.routes import MEDIA_TYPES
+from app.api.schemas import SpeechJobInput
+from app.core.config import settings
+from app.core.logging import logger
+from app.services.jobs import speech_jobs
+from app.services.tts import tts_service
+from app.utils.text import clean_text, smart_split
+
+router = APIRouter()
+
+
+def _job_status(job: SpeechJob) -> dict:
+    body = {
+        "id": str(job.id),
+        "status": job.status,
+        "completed_chunks": job.completed_chunks,
+        "total_chunks": job.total_chunks,
+        "progress": job.completed_chunks / job.total_chunks if job.total_chunks else 0.0,
+        "characters": len(job.text),
+        "response_format": job.response_format,
+        "error": job.error,
+        "created_at": job.created_at,
+        "updated_at": job.updated_at,
+        "finished_at": job.finished_at,
+    }
+    if job.status == "completed":
+        body["content_url"] = f"/v1/audio/speech/jobs/{job.id}/content"
+    return body
+
+
+async def _get_own_job(job_id: UUID, api_key: ApiKey) -> SpeechJob:
+    job = await SpeechJob.get_or_none(id=job_id, api_key_id=api_key.id)
+    if job is None:
+        raise HTTPException(status_code=404, detail="Job not found")
+    return job
+
+
+@router.post("/v1/audio/speech/jobs", status_code=202)
+async def create_speech_job(data: SpeechJobInput, api_key: ApiKey = Depends(get_api_key)):
+    """Queue a long-form synthesis job; poll its status and download the result when done."""
+    if len(data.input) > settings.SPEECH_JOB_MAX_CHARS:
+        raise HTTPException(
+            status_code=413, detail=f"Input exceeds {settings.SPEECH_JOB_MAX_CHARS} characters"
+        )
+    if tts_service.is_warming_up:
+        raise HTTPException(status_code=503, detail="Model loading")
+    text = clean_text(data.input) if data.normalize else data.input
+    total_chunks = 0
+    async for chunk_text, _, pause in smart_split(text, settings.MAX_CHUNK_LENGTH):
+        if pause or chunk_text.strip():
+            total_chunks += 1
+    if total_chunks == 0:
+        raise HTTPException(status_code=400, detail="Input has no text to synthesize")
+
+    job = await SpeechJob.create(
+        api_key=api_key,
+        text=text,
+        model_version=resolve_model_version(data.model),
+        voice=data.voice,
+        speed=data.speed,
+        response_format=data.response_format,
+        max_chunk_length=settings.MAX_CHUNK_LENGTH,
+        steps=resolve_steps(data.model, data.steps),
+        total_chunks=total_chunks,
+    )
+    bill(api_key, len(data.input))
+    speech_jobs.notify()
+    logger.info(f"Queued speech job {job.id} for {api_key.name}: {len(text)} chars, {total_chunks} chunks")
+    return _job_status(job)
+
+
+@router.get("/v1/audio/speech/jobs/{job_id}")
+async def get_speech_job(job_id: UUID, api_key: ApiKey = Depends(get_api_key)):
+    """Job status and chunk progress."""
+    return _job_status(await _get_own_job(job_id, api_key))
+
+
+@router.get("/v1/audio/speech/jobs/{job_id}/content")
+async def get_speech_job_content(job_id: UUID, api_key: ApiKey = Depends(get_api_key)):
+    """Download the audio of a completed job."""
+    job = await _get_own_job(job_id, api_key)
+    if job.status != "completed":
+        raise HTTPException(status_code=409, detail=f"Job is {job.status}")
+    path = speech_jobs.output_path(job)
+    if not os.path.exists(path):
+        raise HTTPException(status_code=410, detail="Job output has expired")
+    return FileResponse(
+        path,
+        media_type=MEDIA_TYPES.get(job.response_format, "application/octet-stream"),
+        filename=f"speech-{job.id}.{job.response_format}",
+    )
+
+
+@router.delete("/v1/audio/speech/jobs/{job_id}")
+async def delete_speech_job(job_id: UUID, api_key: ApiKey = Depends(get_api_key)):
+    """Cancel a job if it is still pending or running, and delete its files."""
+    job = await _get_own_job(job_id, api_key)
+    if job.status in ("queued", "running"):
+        await speech_jobs.cancel(job)
+        return {"id": str(job.id), "status": "cancelled"}
+    await speech_jobs.delete(job)
+    return {"id": str(job.id), "status": "deleted"}
@@ -0,0 +1,244 @@
+"""
+Realtime speech over a WebSocket.
+
+One connection is one session: the client authenticates once, configures
+voice and format, then pushes text as it becomes available. Audio comes
+back as binary frames as soon as each chunk is synthesized, through one
+writer and normalizer that live for the whole session (a cancel replaces
+the writer).
+
+Client messages (JSON text frames):
+    {"type": "config", "voice": "alloy", "response_format": "pcm", ...}  first message
+    {"type": "text", "text": "Hello th"}   append to the current utterance
+    {"type": "flush"}                      end the utterance; synthesize what is left
+    {"type": "cancel"}                     barge-in: drop all audio not yet sent
+
+Server messages:
+    binary frames                          encoded audio (pcm or opus)
+    {"type": "ready", "sample_rate": 44100, "response_format": "pcm"}
+    {"type": "done", "utterance": 1, "characters": 42}
+    {"type": "cancelled", "utterance": 1}
+    {"type": "error", "detail": "..."}
+    {"type": "busy", "retry_after": 3}     text rejected by admission control; resend it later
+"""
+import asyncio
+import json
+from typing import List, Optional
+
+from fastapi import APIRouter, WebSocket, WebSocketDisconnect
+from pydantic import ValidationError
+
+from app.api.auth.models import ApiKey
+from app.api.deps import bill, resolve_model_version, resolve_steps
+from app.api.schemas import RealtimeConfig
+from app.core.database import AuthError, verify_api_key, verify_token
+from app.core.logging import logger
+from app.core.metrics import metrics
+from app.services.admission import admission, AdmissionRejected
+from app.services.audio import AudioNormalizer
+from app.services.streaming_audio_writer import StreamingAudioWriter
+from app.services.tts import tts_service
+from app.utils.text import clean_fragment
+
+router = APIRouter()
+
+
+class _Utterance:
+    """Text pushed between two flushes, synthesized as one incremental stream."""
+
+    def __init__(self, number: int):
+        self.number = number
+        self.characters = 0
+        self.tickets = []  # Admission for each fragment, released when the utterance ends
+        self.fragments: asyncio.Queue = asyncio.Queue()
+        self.task: Optional[asyncio.Task] = None
+
+    async def text(self):
+        while True:
+            fragment = await self.fragments.get()
+            if fragment is None:
+                return
+            yield fragment
+
+
+class RealtimeSession:
+    """Per-connection state: configuration, writer, normalizer and utterances."""
+
+    def __init__(self, websocket: WebSocket, api_key: ApiKey, config: RealtimeConfig, sample_rate: int):
+        self.websocket = websocket
+        self.api_key = api_key
+        self.config = config
+        self.model_version = resolve_model_version(config.model)
+        self.steps = resolve_steps(config.model, config.steps)
+        self.sample_rate = sample_rate
+        self.writer = StreamingAudioWriter(format=config.response_format, sample_rate=sample_rate)
+        self.normalizer = AudioNormalizer()
+        self._utterances: List[_Utterance] = []
+        self._current: Optional[_Utterance] = None
+        self._count = 0
+
+    async def send_json(self, message: dict):
+        try:
+            await self.websocket.send_json(message)
+        except Exception:
+            pass  # Connection already gone
+
+    def push(self, text: str):
+        """Append text to the current utterance, starting one if needed.
+
+        Raises AdmissionRejected, without keeping the text, when the server
+        is at capacity.
+        """
+        if self.config.normalize:
+            text = clean_fragment(text)
+        if not text:
+            return
+        ticket = admission.admit(len(text), self.config.speed, self.steps) if admission is not None else None
+        if self._current is None or self._current.task.done():
+            # A failed utterance takes no more text (its tickets are already released)
+            self._count += 1
+            previous = self._utterances[-1].task if self._utterances else None
+            self._current = _Utterance(self._count)
+            self._current.task = asyncio.ensure_future(self._speak(self._current, previous))
+            self._utterances.append(self._current)
+        if ticket is not None:
+            self._current.tickets.append(ticket)
+        self._current.characters += len(text)
+        self._current.fragments.put_nowait(text)
+
+    def flush(self):
+        """End the current utterance; its remaining text is synthesized."""
+        if self._current is not None:
+            self._current.fragments.put_nowait(None)
+            self._current = None
+
+    async def cancel(self):
+        """Stop every utterance that is still synthesizing or queued."""
+        cancelled = list(self._utterances)
+        self._current = None
+        for utterance in cancelled:
+            utterance.task.cancel()
+        await asyncio.gather(*(u.task for u in cancelled), return_exceptions=True)
+        if cancelled:
+            # An encode already handed to a thread outlives its task; the next
+            # utterance gets a fresh encoder so none of that audio leaks into it
+            writer = self.writer
+            self.writer = StreamingAudioWriter(format=self.config.response_format, sample_rate=self.sample_rate)
+            await asyncio.get_running_loop().run_in_executor(None, writer.close)
+        for utterance in cancelled:
+            metrics.inc("realtime_utterances_cancelled")
+            await self.send_json({"type": "cancelled", "utterance": utterance.number})
+
+    async def _speak(self, utterance: _Utterance, previous: Optional[asyncio.Task]):
+        try:
+            if previous is not None:
+                # Utterances play in order; wait without cancelling the previous one
+                await asyncio.wait({previous})
+            async for chunk in tts_service.generate_audio_stream_incremental(
+                utterance.text(),
+                self.config.voice,
+                self.writer,
+                speed=self.config.speed,
+                output_format=self.config.response_format,
+                model_version=self.model_version,
+                tenant=str(self.api_key.id),
+                weight=self.api_key.weight,
+                normalizer=self.normalizer,
+                finalize=False,
+                steps=self.steps,
+            ):
+                if chunk.output:
+                    await self.websocket.send_bytes(chunk.output)
+            await self.send_json(
+                {"type": "done", "utterance": utterance.number, "characters": utterance.characters}
+            )
+        except asyncio.CancelledError:
+            raise
+        except Exception as e:
+            logger.error(f"Realtime synthesis error: {e}")
+            await self.send_json({"type": "error", "detail": "Synthesis failed", "utterance": utterance.number})
+        finally:
+            self._utterances.remove(utterance)
+            if admission is not None:
+                for ticket in utterance.tickets:
+                    admission.release(ticket)
+            if utterance.characters:
+                bill(self.api_key, utterance.characters)
+
+    async def close(self):
+        await self.cancel()
+        self.writer.close()
+
+
+async def _authenticate(websocket: WebSocket, config: RealtimeConfig) -> ApiKey:
+    """Bearer header on the handshake, or the api_key field for clients that cannot set headers."""
+    if config.api_key:
+        return await verify_token(config.api_key)
+    return await verify_api_key(websocket)
+
+
+@router.websocket("/v1/audio/speech/ws")
+async def speech_websocket(websocket: WebSocket):
+    """Realtime TTS: push text incrementally, receive audio frames as chunks finish."""
+    await websocket.accept()
+    session = None
+    try:
+        try:
+            config = RealtimeConfig(**json.loads(await websocket.receive_text()))
+        except (ValueError, TypeError, ValidationError) as e:
+            await websocket.send_json({"type": "error", "detail": f"Invalid config message: {e}"})
+            await websocket.close(code=1008)
+            return
+        api_key = await _authenticate(websocket, config)
+
+        if tts_service.is_warming_up:
+            await websocket.send_json({"type": "error", "detail": "Model loading"})
+            await websocket.close(code=1013)
+            return
+
+        model = await tts_service.get_model(resolve_model_version(config.model))
+
+        session = RealtimeSession(websocket, api_key, config, model.sample_rate)
+        metrics.inc("realtime_sessions")
+        metrics.add_gauge("realtime_sessions_active", 1)
+        await websocket.send_json(
+            {"type": "ready", "sample_rate": model.sample_rate, "response_format": config.response_format}
+        )
+
+        while True:
+            raw = await websocket.receive_text()
+            try:
+                message = json.loads(raw)
+                kind = message.get("type")
+            except (ValueError, AttributeError):
+                await session.send_json({"type": "error", "detail": "Messages must be JSON objects"})
+                continue
+
+            if kind == "text":
+                try:
+                    session.push(str(message.get("text", "")))
+                except AdmissionRejected as e:
+                    logger.warning(f"Rejected realtime text from {session.api_key.name}: {e}")
+                    await session.send_json({"type": "busy", "retry_after": e.retry_after_s})
+            elif kind == "flush":
+                session.flush()
+            elif kind == "cancel":
+                await session.cancel()
+            else:
+                await session.send_json({"type": "error", "detail": f"Unknown message type: {kind}"})
+
+    except WebSocketDisconnect:
+        pass
+    except AuthError as e:
+        await websocket.send_json({"type": "error", "detail": e.detail})
+        await websocket.close(code=1008)
+    except Exception as e:
+        logger.error(f"Realtime session error: {e}")
+        try:
+            await websocket.close(code=1011)
+        except Exception:
+            pass
+    finally:
+        if session is not None:
+            await session.close()
+            metrics.add_gauge("realtime_sessions_active", -1)
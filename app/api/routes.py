@@ -1,24 +1,30 @@
 import time
+import json
+import base64
+import uuid
+import zipfile
 import asyncio
-from fastapi import APIRouter, Depends, HTTPException
-from fastapi.responses import Response
+from typing import Optional
+from fastapi import APIRouter, Depends, HTTPException, Request
+from fastapi.responses import Response, StreamingResponse
 
 from app.core.config import settings
 from app.core.voices import OPENAI_VOICE_NAMES
-from app.api.schemas import OpenAIInput
-from app.api.deps import get_api_key
+from app.api.schemas import OpenAIInput, BatchSpeechInput, BatchSpeechItem
+from app.api.deps import bill, get_api_key, resolve_model_version, resolve_steps
 from app.api.auth.models import ApiKey
 from app.services.tts import tts_service
 from app.utils.text import clean_text
 from app.core.logging import logger
-from app.core.database import track_usage
+from app.core.metrics import metrics
 from app.services.streaming_audio_writer import StreamingAudioWriter
+from app.services.cache import make_cache_key, response_cache
+from app.services.coalescing import single_flight
+from app.services.admission import admission, AdmissionRejected
+from app.services.deadlines import DeadlineExceeded, deadline_after
 
 router = APIRouter()
 
-# Concurrency limiter for TTS requests
-concurrency_limiter = asyncio.Semaphore(settings.MAX_WORKERS * 50)
-
 # Media type mappings
 MEDIA_TYPES = {
     "mp3": "audio/mpeg",
@@ -29,64 +35,386 @@ MEDIA_TYPES = {
 }
 
 
+async def _synthesize_bytes(
+    text: str,
+    data: OpenAIInput,
+    model_version: str,
+    sample_rate: int,
+    cache_key: str,
+    api_key: ApiKey,
+    deadline: Optional[float] = None,
+):
+    """Produce encoded audio for a request and cache it once complete."""
+    writer = StreamingAudioWriter(format=data.response_format, sample_rate=sample_rate)
+    collected = bytearray() if response_cache is not None else None
+    ctx = await tts_service.stream_context(
+        data.voice, data.speed, model_version, str(api_key.id), api_key.weight, deadline, steps=data.steps
+    )
+    try:
+        async for chunk in tts_service.generate_audio_stream(
+            text,
+            data.voice,
+            writer,
+            output_format=data.response_format,
+            chunking=data.chunking,
+            ctx=ctx,
+        ):
+            if not chunk.output:
+                continue
+            if collected is not None:
+                collected.extend(chunk.output)
+            yield chunk.output
+    finally:
+        writer.close()
+
+    if ctx.failed_chunks:
+        logger.warning(f"Not caching response with {ctx.failed_chunks} failed chunk(s)")
+    elif collected:
+        loop = asyncio.get_running_loop()
+        await loop.run_in_executor(None, response_cache.put, cache_key, bytes(collected))
+
+
+def _audio_source(
+    text: str,
+    data: OpenAIInput,
+    model_version: str,
+    sample_rate: int,
+    cache_key: str,
+    api_key: ApiKey,
+    deadline: Optional[float] = None,
+):
+    """Encoded audio for a request, shared with identical in-flight requests.
+
+    A coalesced synthesis runs without a deadline, so one request's deadline
+    never cuts short the audio of the others (or the cached copy); each
+    request enforces its own while it follows.
+    """
+    def factory(deadline=None):
+        return _synthesize_bytes(
+            text, data, model_version, sample_rate, cache_key, api_key, deadline
+        )
+
+    if settings.COALESCE_REQUESTS:
+        return single_flight.subscribe(cache_key, factory, deadline)
+    return factory(deadline)
+
+
+class ClientDisconnected(Exception):
+    """The client hung up before the response was complete."""
+
+
+async def _wait_for_disconnect(request: Request):
+    """Return once the client has closed the connection."""
+    while True:
+        message = await request.receive()
+        if message["type"] == "http.disconnect":
+            return
+
+
+async def _until_disconnect(source, request: Request):
+    """Relay source, abandoning it the moment the client disconnects.
+
+    Closing the source cancels the chunks it has queued or in flight, so no
+    further inference or encoding is spent on a response nobody will read.
+    """
+    watcher = asyncio.ensure_future(_wait_for_disconnect(request))
+    try:
+        while True:
+            next_chunk = asyncio.ensure_future(source.__anext__())
+            await asyncio.wait({next_chunk, watcher}, return_when=asyncio.FIRST_COMPLETED)
+            if not next_chunk.done():
+                next_chunk.cancel()
+                await asyncio.gather(next_chunk, return_exceptions=True)
+                metrics.inc("requests_cancelled", reason="disconnect")
+                raise ClientDisconnected()
+            try:
+                chunk = next_chunk.result()
+            except StopAsyncIteration:
+                return
+            yield chunk
+    finally:
+        watcher.cancel()
+        await source.aclose()
+
+
+class _AdmittedStreamingResponse(StreamingResponse):
+    """Streaming response that holds an admission ticket until it has been sent.
+
+    The ticket is released when the response ends however it ends, even if
+    the client disconnected before the body generator was ever started (its
+    ``finally`` would never run then).
+    """
+
+    def __init__(self, content, ticket=None, **kwargs):
+        super().__init__(content, **kwargs)
+        self.ticket = ticket
+
+    async def __call__(self, scope, receive, send):
+        try:
+            await super().__call__(scope, receive, send)
+        finally:
+            if admission is not None:
+                admission.release(self.ticket)
+
+
+async def _stream_audio(source, text: str, start_time: float):
+    """Yield encoded audio chunks as they are synthesized."""
+    first_chunk_time = None
+    try:
+        async for chunk in source:
+            if first_chunk_time is None:
+                first_chunk_time = (time.time() - start_time) * 1000
+                logger.info(f"TTS First Chunk: {first_chunk_time:.2f}ms")
+            yield chunk
+    except ClientDisconnected:
+        logger.info("Client disconnected, streaming synthesis stopped")
+    except DeadlineExceeded as e:
+        # The audio sent so far was finalized; end the stream there
+        logger.warning(f"Streaming response truncated: {e}")
+    except Exception as e:
+        # Headers are already sent, so the only option is to end the stream
+        logger.error(f"Streaming synthesis error: {e}")
+    finally:
+        total_time = (time.time() - start_time) * 1000
+        logger.info(f"TTS Stream Total Time: {total_time:.2f}ms for {len(text)} chars")
+
+
+def _sse(event: dict) -> str:
+    return f"data: {json.dumps(event)}\n\n"
+
+
+async def _sse_events(
+    request: Request,
+    text: str,
+    data: OpenAIInput,
+    model_version: str,
+    sample_rate: int,
+    api_key: ApiKey,
+    deadline: Optional[float],
+    start_time: float,
+):
+    """Server-sent events: one per chunk with base64 audio, its text, sample offset and timings."""
+    writer = StreamingAudioWriter(format=data.response_format, sample_rate=sample_rate)
+    sample_offset = 0
+    chunks = 0
+    inference_ms = 0.0
+    encode_ms = 0.0
+    first_chunk_ms = None
+    source = tts_service.generate_audio_stream(
+        text,
+        data.voice,
+        writer,
+        speed=data.speed,
+        output_format=data.response_format,
+        model_version=model_version,
+        tenant=str(api_key.id),
+        weight=api_key.weight,
+        deadline=deadline,
+        chunking=data.chunking,
+        steps=data.steps,
+    )
+    try:
+        async for chunk in _until_disconnect(source, request):
+            samples = len(chunk.audio) if chunk.audio is not None else 0
+            if first_chunk_ms is None:
+                first_chunk_ms = (time.time() - start_time) * 1000
+            yield _sse({
+                "type": "speech.audio.delta",
+                "audio": base64.b64encode(chunk.output or b"").decode("ascii"),
+                "text": chunk.text,
+                "sample_offset": sample_offset,
+                "samples": samples,
+                "inference_ms": chunk.inference_ms,
+                "encode_ms": chunk.encode_ms,
+            })
+            sample_offset += samples
+            chunks += 1 if chunk.text else 0
+            inference_ms += chunk.inference_ms or 0.0
+            encode_ms += chunk.encode_ms or 0.0
+
+        yield _sse({
+            "type": "speech.audio.done",
+            "sample_rate": sample_rate,
+            "samples": sample_offset,
+            "duration_s": sample_offset / sample_rate,
+            "chunks": chunks,
+            "characters": len(text),
+            "inference_ms": inference_ms,
+            "encode_ms": encode_ms,
+            "first_chunk_ms": first_chunk_ms,
+            "total_ms": (time.time() - start_time) * 1000,
+        })
+    except ClientDisconnected:
+        logger.info("Client disconnected, SSE synthesis stopped")
+    except DeadlineExceeded as e:
+        logger.warning(f"SSE response truncated: {e}")
+        yield _sse({"type": "error", "detail": "Request deadline exceeded", "samples": sample_offset})
+    except Exception as e:
+        logger.error(f"SSE synthesis error: {e}")
+        yield _sse({"type": "error", "detail": "Synthesis failed", "samples": sample_offset})
+    finally:
+        writer.close()
+
+
 @router.post("/v1/audio/speech")
 async def generate_speech(
     data: OpenAIInput,
+    request: Request,
     api_key: ApiKey = Depends(get_api_key),
 ):
     """Generate speech from text using TTS."""
+    ticket = None
     try:
-        # Calculate and track usage
         char_count = len(data.input)
-        cost = (char_count / 1_000_000) * api_key.price_per_million_chars
-        asyncio.create_task(track_usage(api_key, char_count, cost))
-        logger.info(f"Queued billing for {api_key.name}: {char_count} chars, ${cost:.6f}")
-
-        # Check model availability
-        if not tts_service.model:
-            raise HTTPException(status_code=503, detail="Model loading")
+        timeout_s = data.timeout
+        if timeout_s is None and "x-request-timeout" in request.headers:
+            try:
+                timeout_s = float(request.headers["x-request-timeout"])
+            except ValueError:
+                raise HTTPException(status_code=400, detail="Invalid X-Request-Timeout header")
+        deadline = deadline_after(settings.REQUEST_TIMEOUT_S if timeout_s is None else timeout_s)
 
         # Normalize text if requested
         normalized_text = clean_text(data.input) if data.normalize else data.input
         logger.debug(f"Normalized text: {normalized_text[:100]}...")
 
-        sample_rate = getattr(tts_service.model, "sample_rate", settings.SAMPLE_RATE)
         media_type = MEDIA_TYPES.get(data.response_format, "audio/wav")
         filename = f"speech.{data.response_format}"
 
         # Determine model version from model name
-        model_version = None
-        if data.model in ["tts-2", "tts-2-hd", "supertonic-v2"]:
-            model_version = "v2"
+        model_version = resolve_model_version(data.model)
+        # SSE events carry per-chunk metadata, so they bypass the byte-level cache and coalescing
+        sse = data.stream_format == "sse"
+
+        # Chunk boundaries shape prosody, so the policy is part of the cache key
+        if not data.chunking:
+            policy = settings.CHUNKING_POLICY
+            if policy == "auto":
+                policy = "adaptive" if data.stream or sse else "fixed"
+            data.chunking = policy
+        data.steps = resolve_steps(data.model, data.steps)
+
+        # Serve repeated prompts from the response cache
+        cache_key = make_cache_key(
+            normalized_text, data.voice, data.speed,
+            model_version or settings.DEFAULT_MODEL_VERSION, data.response_format,
+            chunking=data.chunking, steps=data.steps,
+        )
+        if response_cache is not None and not sse:
+            etag = f'"{cache_key}"'
+            loop = asyncio.get_running_loop()
+            # The ETag names cached bytes; anything not (or no longer) cached is re-rendered
+            if etag in request.headers.get("if-none-match", "") and await loop.run_in_executor(
+                None, response_cache.contains, cache_key
+            ):
+                return Response(status_code=304, headers={"ETag": etag})
+            cached = await loop.run_in_executor(None, response_cache.get, cache_key)
+            if cached is not None:
+                bill(api_key, char_count)
+                return Response(
+                    content=cached,
+                    media_type=media_type,
+                    headers={
+                        "Content-Disposition": f'inline; filename="{filename}"',
+                        "ETag": etag,
+                        "X-Cache": "HIT",
+                    },
+                )
+
+        # Check model availability
+        if tts_service.is_warming_up:
+            raise HTTPException(status_code=503, detail="Model loading", headers={"Retry-After": "5"})
+
+        # Shed load early; joining an identical in-flight synthesis costs nothing
+        joins_flight = settings.COALESCE_REQUESTS and not sse and single_flight.in_flight(cache_key)
+        if admission is not None and not joins_flight:
+            try:
+                ticket = admission.admit(len(normalized_text), data.speed, data.steps)
+            except AdmissionRejected as e:
+                logger.warning(f"Rejected request from {api_key.name}: {e}")
+                raise HTTPException(
+                    status_code=429,
+                    detail="Server is at capacity, retry later",
+                    headers={"Retry-After": str(e.retry_after_s)},
+                )
+
+        bill(api_key, char_count)
+
+        # No ETag yet: the output may end up truncated and uncached
+        cache_headers = {"X-Cache": "MISS"} if response_cache else {}
+
+        resident = tts_service.registry.peek(model_version or settings.DEFAULT_MODEL_VERSION)
+        sample_rate = getattr(resident or tts_service.model, "sample_rate", settings.SAMPLE_RATE)
 
         start_time = time.time()
 
-        try:
-            writer = StreamingAudioWriter(
-                format=data.response_format, sample_rate=sample_rate
+        if sse:
+            # The response releases the admission ticket when it ends
+            stream_ticket, ticket = ticket, None
+            return _AdmittedStreamingResponse(
+                _sse_events(
+                    request, normalized_text, data, model_version, sample_rate,
+                    api_key, deadline, start_time,
+                ),
+                ticket=stream_ticket,
+                media_type="text/event-stream",
+                headers={"Cache-Control": "no-cache", "X-Accel-Buffering": "no"},
             )
 
-            processed = await tts_service.generate_audio(
-                normalized_text,
-                data.voice,
-                writer,
-                speed=data.speed,
-                output_format=data.response_format,
-                model_version=model_version,
+        try:
+            source = _until_disconnect(
+                _audio_source(
+                    normalized_text, data, model_version, sample_rate, cache_key, api_key, deadline
+                ),
+                request,
             )
 
+            if data.stream:
+                # The response releases the admission ticket when it ends
+                stream_ticket, ticket = ticket, None
+                return _AdmittedStreamingResponse(
+                    _stream_audio(source, normalized_text, start_time),
+                    ticket=stream_ticket,
+                    media_type=media_type,
+                    headers={
+                        "Content-Disposition": f'inline; filename="{filename}"',
+                        "X-Accel-Buffering": "no",
+                        **cache_headers,
+                    },
+                )
+
+            output = bytearray()
+            try:
+                async for chunk in source:
+                    output.extend(chunk)
+            except ClientDisconnected:
+                logger.info(f"Client disconnected after {len(output)} bytes, synthesis stopped")
+                # Nobody is listening; nginx's "client closed request"
+                return Response(status_code=499)
+            except DeadlineExceeded as e:
+                logger.warning(f"Request deadline exceeded after {len(output)} bytes: {e}")
+                raise HTTPException(status_code=504, detail="Request deadline exceeded")
+
             total_time = (time.time() - start_time) * 1000
             logger.info(f"TTS Total Time: {total_time:.2f}ms for {char_count} chars")
 
-            if not processed.output:
+            if not output:
                 raise ValueError("No audio output generated")
 
+            # Only a complete response that made it into the cache can be revalidated
+            if response_cache is not None and await asyncio.get_running_loop().run_in_executor(
+                None, response_cache.contains, cache_key
+            ):
+                cache_headers["ETag"] = f'"{cache_key}"'
+
             return Response(
-                content=bytes(processed.output),
+                content=bytes(output),
                 media_type=media_type,
-                headers={"Content-Disposition": f'inline; filename="{filename}"'},
+                headers={"Content-Disposition": f'inline; filename="{filename}"', **cache_headers},
             )
 
+        except HTTPException:
+            raise
         except Exception as e:
             logger.error(f"Synthesis error: {e}")
             raise HTTPException(status_code=500, detail=str(e))
@@ -98,6 +426,184 @@ async def generate_speech(
         logger.error(f"Unhandled error: {e}")
         logger.error(traceback.format_exc())
         raise HTTPException(status_code=500, detail="Internal Server Error")
+    finally:
+        if admission is not None:
+            admission.release(ticket)
+
+
+class _ZipSink:
+    """Write-only buffer that lets zipfile stream entries out as they are written."""
+
+    def __init__(self):
+        self._chunks = []
+
+    def write(self, data) -> int:
+        self._chunks.append(bytes(data))
+        return len(data)
+
+    def flush(self):
+        pass
+
+    def drain(self) -> bytes:
+        data = b"".join(self._chunks)
+        self._chunks.clear()
+        return data
+
+
+async def _render_batch_item(item: BatchSpeechItem, batch: BatchSpeechInput, api_key: ApiKey) -> bytes:
+    """Synthesize one batch item, through the response cache when enabled."""
+    text = clean_text(item.input) if batch.normalize else item.input
+    model_version = resolve_model_version(batch.model)
+    version = model_version or settings.DEFAULT_MODEL_VERSION
+    steps = resolve_steps(batch.model, batch.steps)
+    cache_key = make_cache_key(
+        text, item.voice, item.speed, version, item.response_format, chunking="fixed", steps=steps
+    )
+    loop = asyncio.get_running_loop()
+    if response_cache is not None:
+        cached = await loop.run_in_executor(None, response_cache.get, cache_key)
+        if cached is not None:
+            return cached
+
+    resident = tts_service.registry.peek(version)
+    sample_rate = getattr(resident or tts_service.model, "sample_rate", settings.SAMPLE_RATE)
+    writer = StreamingAudioWriter(format=item.response_format, sample_rate=sample_rate)
+    ctx = await tts_service.stream_context(
+        item.voice, item.speed, model_version, str(api_key.id), api_key.weight, steps=steps
+    )
+    try:
+        result = await tts_service.generate_audio(
+            text, item.voice, writer, item.speed, item.response_format, model_version, ctx=ctx,
+        )
+    finally:
+        writer.close()
+    if not result.output:
+        raise ValueError("No audio output generated")
+    if ctx.failed_chunks:
+        logger.warning(f"Not caching batch item with {ctx.failed_chunks} failed chunk(s)")
+    elif response_cache is not None:
+        await loop.run_in_executor(None, response_cache.put, cache_key, result.output)
+    return result.output
+
+
+async def _batch_results(batch: BatchSpeechInput, api_key: ApiKey):
+    """Yield (index, audio or None, error or None) as items finish.
+
+    All items share the chunk inference path, so their chunks fill
+    micro-batches together; at most SPEECH_BATCH_CONCURRENCY run at once.
+    """
+    semaphore = asyncio.Semaphore(max(1, settings.SPEECH_BATCH_CONCURRENCY))
+
+    async def run(index: int, item: BatchSpeechItem):
+        async with semaphore:
+            try:
+                return index, await _render_batch_item(item, batch, api_key), None
+            except Exception as e:
+                logger.error(f"Batch item {index} failed: {e}")
+                return index, None, str(e) or type(e).__name__
+
+    tasks = [asyncio.ensure_future(run(i, item)) for i, item in enumerate(batch.items)]
+    try:
+        for next_done in asyncio.as_completed(tasks):
+            yield await next_done
+    finally:
+        for task in tasks:
+            task.cancel()
+
+
+def _batch_filename(index: int, item: BatchSpeechItem) -> str:
+    return f"{item.id or f'{index:05d}'}.{item.response_format}"
+
+
+async def _batch_stream(batch: BatchSpeechInput, api_key: ApiKey, boundary: str):
+    """Package batch results as a zip or multipart stream, billing once at the end."""
+    manifest = [None] * len(batch.items)
+    billed_chars = 0
+    sink = _ZipSink()
+    archive = zipfile.ZipFile(sink, "w", compression=zipfile.ZIP_STORED) if batch.container == "zip" else None
+    try:
+        async for index, audio, error in _batch_results(batch, api_key):
+            item = batch.items[index]
+            filename = _batch_filename(index, item)
+            manifest[index] = {"index": index, "id": item.id, "file": filename if audio else None, "error": error}
+            if audio is None:
+                metrics.inc("speech_batch_items", status="error")
+                continue
+            metrics.inc("speech_batch_items", status="ok")
+            billed_chars += len(item.input)
+            if archive is not None:
+                archive.writestr(filename, audio)
+                yield sink.drain()
+            else:
+                yield (
+                    f"--{boundary}\r\n"
+                    f"Content-Type: {MEDIA_TYPES.get(item.response_format, 'application/octet-stream')}\r\n"
+                    f'Content-Disposition: attachment; filename="{filename}"\r\n'
+                    f"X-Item-Index: {index}\r\n\r\n"
+                ).encode() + audio + b"\r\n"
+
+        # Per-item status, errors included, closes the response
+        summary = json.dumps({"items": manifest}, indent=2).encode()
+        if archive is not None:
+            archive.writestr("manifest.json", summary)
+            archive.close()
+            yield sink.drain()
+        else:
+            yield (
+                f"--{boundary}\r\n"
+                "Content-Type: application/json\r\n"
+                'Content-Disposition: attachment; filename="manifest.json"\r\n\r\n'
+            ).encode() + summary + f"\r\n--{boundary}--\r\n".encode()
+    finally:
+        if billed_chars:
+            bill(api_key, billed_chars)
+
+
+@router.post("/v1/audio/speech/batch")
+async def generate_speech_batch(
+    batch: BatchSpeechInput,
+    api_key: ApiKey = Depends(get_api_key),
+):
+    """Synthesize many inputs in one call, returned as a zip or multipart stream."""
+    if len(batch.items) > settings.SPEECH_BATCH_MAX_ITEMS:
+        raise HTTPException(
+            status_code=413, detail=f"At most {settings.SPEECH_BATCH_MAX_ITEMS} items per batch"
+        )
+    ids = [item.id for item in batch.items if item.id]
+    if len(ids) != len(set(ids)):
+        raise HTTPException(status_code=422, detail="Item ids must be unique")
+    if tts_service.is_warming_up:
+        raise HTTPException(status_code=503, detail="Model loading", headers={"Retry-After": "5"})
+
+    # The whole batch is admitted up front; the response releases it when it ends
+    ticket = None
+    if admission is not None:
+        steps = resolve_steps(batch.model, batch.steps)
+        try:
+            ticket = admission.reserve(
+                sum(admission.estimate(len(item.input), item.speed, steps) for item in batch.items)
+            )
+        except AdmissionRejected as e:
+            logger.warning(f"Rejected batch of {len(batch.items)} items from {api_key.name}: {e}")
+            raise HTTPException(
+                status_code=429,
+                detail="Server is at capacity, retry later",
+                headers={"Retry-After": str(e.retry_after_s)},
+            )
+
+    boundary = uuid.uuid4().hex
+    if batch.container == "zip":
+        media_type = "application/zip"
+        headers = {"Content-Disposition": 'attachment; filename="speech.zip"'}
+    else:
+        media_type = f"multipart/mixed; boundary={boundary}"
+        headers = {}
+    return _AdmittedStreamingResponse(
+        _batch_stream(batch, api_key, boundary),
+        ticket=ticket,
+        media_type=media_type,
+        headers={"X-Accel-Buffering": "no", **headers},
+    )
 
 
 @router.get("/v1/models")
@@ -123,6 +629,14 @@ async def list_models():
                 "version": "2.0",
                 "providers": ort.get_available_providers(),
             },
+            {"id": "supertonic-int8", "created": 1677610602, "owned_by": "supertone", "quantization": "int8"},
+            {
+                "id": "supertonic-v2-int8",
+                "created": 1704067200,
+                "owned_by": "supertone",
+                "version": "2.0",
+                "quantization": "int8",
+            },
         ]
     }
 
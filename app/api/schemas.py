@@ -1,5 +1,9 @@
 from pydantic import BaseModel, Field
-from typing import Optional, Literal
+from typing import List, Optional, Literal
+
+from app.core.config import settings
+
+_STEPS_DESCRIPTION = "Denoising steps (default: the model's quality tier)"
 
 
 class OpenAIInput(BaseModel):
@@ -12,6 +16,72 @@ class OpenAIInput(BaseModel):
     )
     speed: Optional[float] = Field(default=1.0, ge=0.25, le=4.0, description="Speech speed multiplier")
     normalize: bool = Field(default=True, description="Whether to normalize text before synthesis")
+    stream: bool = Field(default=False, description="Stream audio chunks as they are synthesized")
+    stream_format: Literal["audio", "sse"] = Field(
+        default="audio", description="Raw audio bytes, or server-sent events with per-chunk metadata"
+    )
+    chunking: Optional[Literal["fixed", "adaptive"]] = Field(
+        default=None, description="Chunk sizing policy (default: adaptive when streaming)"
+    )
+    timeout: Optional[float] = Field(
+        default=None, gt=0, description="Seconds before unfinished synthesis is abandoned"
+    )
+    steps: Optional[int] = Field(
+        default=None, ge=1, le=settings.MAX_DENOISING_STEPS, description=_STEPS_DESCRIPTION
+    )
+
+
+class BatchSpeechItem(BaseModel):
+    """One input of a batch speech request."""
+    input: str = Field(..., description="Text to convert to speech")
+    voice: str = Field(default="alloy", description="Voice to use for synthesis")
+    response_format: Literal["mp3", "opus", "aac", "flac", "wav", "pcm"] = Field(
+        default="mp3", description="Output audio format"
+    )
+    speed: float = Field(default=1.0, ge=0.25, le=4.0, description="Speech speed multiplier")
+    id: Optional[str] = Field(
+        default=None, pattern=r"^[\w.-]{1,64}$", description="Name for the output file (default: item index)"
+    )
+
+
+class BatchSpeechInput(BaseModel):
+    """Many speech inputs synthesized in one call."""
+    model: str = Field(default="tts-1", description="TTS model to use")
+    items: List[BatchSpeechItem] = Field(..., min_length=1, description="Inputs to synthesize")
+    steps: Optional[int] = Field(
+        default=None, ge=1, le=settings.MAX_DENOISING_STEPS, description=_STEPS_DESCRIPTION
+    )
+    normalize: bool = Field(default=True, description="Whether to normalize text before synthesis")
+    container: Literal["zip", "multipart"] = Field(default="zip", description="Response packaging")
+
+
+class SpeechJobInput(BaseModel):
+    """Long-form synthesis job input."""
+    model: str = Field(default="tts-1", description="TTS model to use")
+    input: str = Field(..., description="Text to convert to speech")
+    voice: str = Field(default="alloy", description="Voice to use for synthesis")
+    response_format: Literal["mp3", "opus", "aac", "flac", "wav", "pcm"] = Field(
+        default="mp3", description="Output audio format"
+    )
+    speed: float = Field(default=1.0, ge=0.25, le=4.0, description="Speech speed multiplier")
+    normalize: bool = Field(default=True, description="Whether to normalize text before synthesis")
+    steps: Optional[int] = Field(
+        default=None, ge=1, le=settings.MAX_DENOISING_STEPS, description=_STEPS_DESCRIPTION
+    )
+
+
+class RealtimeConfig(BaseModel):
+    """First message of a realtime WebSocket session."""
+    type: Literal["config"] = "config"
+    api_key: Optional[str] = Field(default=None, description="API key, if not sent as a Bearer header")
+    model: str = Field(default="tts-1", description="TTS model to use")
+    voice: str = Field(default="alloy", description="Voice to use for synthesis")
+    response_format: Literal["pcm", "opus"] = Field(default="pcm", description="Audio frame format")
+    speed: float = Field(default=1.0, ge=0.25, le=4.0, description="Speech speed multiplier")
+    normalize: bool = Field(default=True, description="Whether to normalize text before synthesis")
+    steps: Optional[int] = Field(
+        default=None, ge=1, le=settings.MAX_DENOISING_STEPS, description=_STEPS_DESCRIPTION
+    )
 
 
 class ModelObject(BaseModel):
@@ -1,6 +1,11 @@
 import os
 from pydantic_settings import BaseSettings
 
+try:
+    from supertonic.config import DEFAULT_TOTAL_STEPS as LIBRARY_DENOISING_STEPS
+except ImportError:  # Older supertonic releases did not export it; their default was 5
+    LIBRARY_DENOISING_STEPS = 5
+
 class Settings(BaseSettings):
     LOG_LEVEL: str = "INFO"
     HOST: str = "0.0.0.0"
@@ -10,6 +15,41 @@ class Settings(BaseSettings):
     FORCE_PROVIDERS: str = "metal" # auto, cuda, coreml, cpu, metal
     MAX_WORKERS: int = 8
     MAX_CHUNK_LENGTH: int = 300
+    # Chunk sizing: "fixed" packs every chunk up to MAX_CHUNK_LENGTH; "adaptive"
+    # starts at FIRST_CHUNK_LENGTH and grows with the measured RTF; "auto" is
+    # adaptive for streamed responses and fixed otherwise
+    CHUNKING_POLICY: str = "auto"
+    FIRST_CHUNK_LENGTH: int = 60
+    PIPELINE_DEPTH: int = 3  # Chunks in flight per stream (1 = serial)
+
+    # Cross-request micro-batching (BATCH_MAX_SIZE=1 disables batching)
+    BATCH_MAX_SIZE: int = 1
+    BATCH_MAX_WAIT_MS: float = 5.0
+    BATCH_BUCKET_EDGES: list = [40, 100, 200]  # Text-length bucket upper bounds ([] = FIFO)
+    BATCH_AGING_MS: float = 2.5  # Aged items may join a neighbouring bucket's batch
+
+    # ONNX Runtime session options for every model session
+    ORT_GRAPH_OPTIMIZATION: str = "all"  # disable, basic, extended, all
+    ORT_EXECUTION_MODE: str = "sequential"  # sequential or parallel (uses MODEL_INTER_THREADS)
+    ORT_ENABLE_CPU_MEM_ARENA: bool = True
+    ORT_ENABLE_MEM_PATTERN: bool = True
+    # Optimized graphs are saved here and reused on later starts (CPU only, "" = off)
+    ORT_OPTIMIZED_MODEL_DIR: str = "cache/ort"
+
+    # INT8 dynamic quantization for every model version; single versions can
+    # be selected with the "-int8" model names (e.g. supertonic-int8)
+    INT8_QUANTIZATION: bool = False
+    INT8_OP_TYPES: list = ["MatMul", "Gemm"]  # Op types to quantize ([] = all supported)
+
+    # Inference backend: "thread" (in-process) or "process" (worker pool)
+    INFERENCE_BACKEND: str = "thread"
+    INFERENCE_PROCESSES: int = 0  # 0 = cpu_count // PROCESS_THREADS
+    PROCESS_THREADS: int = 2  # ONNX intra-op threads per worker process
+    PIN_WORKER_CPUS: bool = True
+
+    # Per-stage thread pools (0 = MAX_WORKERS)
+    INFERENCE_EXECUTOR_WORKERS: int = 0
+    ENCODE_EXECUTOR_WORKERS: int = 0
     SAMPLE_RATE: int = 44100
     
     # Audio Trimming & Gaps
@@ -27,6 +67,63 @@ class Settings(BaseSettings):
     # Model Version (v1 or v2 for Supertonic)
     DEFAULT_MODEL_VERSION: str = "v1"
 
+    # Quality tiers: denoising steps per API model name (more steps = higher
+    # quality, slower). Other model names use DENOISING_STEPS, which defaults
+    # to the installed supertonic's own default; requests may override with
+    # "steps" up to MAX_DENOISING_STEPS
+    DENOISING_STEPS: int = LIBRARY_DENOISING_STEPS
+    QUALITY_TIERS: dict = {
+        "tts-1": LIBRARY_DENOISING_STEPS,
+        "tts-1-hd": 2 * LIBRARY_DENOISING_STEPS,
+        "tts-2": LIBRARY_DENOISING_STEPS,
+        "tts-2-hd": 2 * LIBRARY_DENOISING_STEPS,
+    }
+    MAX_DENOISING_STEPS: int = 32
+
+    # Model registry: resident versions are evicted LRU above this budget (0 = unlimited)
+    MODEL_MEMORY_BUDGET_MB: float = 0
+    MODEL_SIZE_ESTIMATE_MB: float = 400  # Used when RSS cannot be measured
+
+    # Startup preload and warm-up ([] = lazy load on first request)
+    PRELOAD_MODEL_VERSIONS: list = ["v1"]
+    WARMUP_VOICES: list = []  # [] = every native style of the model
+    WARMUP_TEXT_LENGTHS: list = [30, 120, 300]
+
+    # Full-response audio cache (memory LRU + disk tier, RESPONSE_CACHE_DISK_MB=0 disables disk)
+    RESPONSE_CACHE_ENABLED: bool = True
+    RESPONSE_CACHE_MEMORY_MB: float = 64
+    RESPONSE_CACHE_DIR: str = "cache/responses"
+    RESPONSE_CACHE_DISK_MB: float = 1024
+
+    # Sentence-level PCM cache (0 = disabled)
+    PCM_CACHE_MB: float = 128
+    PCM_CACHE_BLOCK_SAMPLES: int = 4096
+
+    # Attach identical concurrent requests to one in-flight synthesis
+    COALESCE_REQUESTS: bool = True
+
+    # Default per-request deadline in seconds (0 = none); overridden by the
+    # request's "timeout" field or X-Request-Timeout header
+    REQUEST_TIMEOUT_S: float = 0.0
+
+    # /v1/audio/speech/batch
+    SPEECH_BATCH_MAX_ITEMS: int = 1000
+    SPEECH_BATCH_CONCURRENCY: int = 32  # Items synthesized at once per call
+
+    # Long-form speech jobs (/v1/audio/speech/jobs)
+    SPEECH_JOB_DIR: str = "jobs"  # Spool and output files
+    SPEECH_JOB_WORKERS: int = 1  # Jobs processed at once
+    SPEECH_JOB_MAX_CHARS: int = 1_000_000
+    SPEECH_JOB_RETENTION_HOURS: float = 24.0  # Finished jobs are deleted after this
+    SPEECH_JOB_LEASE_S: float = 60.0  # A running job whose runner stops renewing this long is requeued
+
+    # Admission control: reject with 429 when the backlog exceeds the latency budget
+    ADMISSION_ENABLED: bool = True
+    ADMISSION_LATENCY_BUDGET_S: float = 60.0
+    ADMISSION_PARALLELISM: int = 0  # 0 = inference executor size
+    ADMISSION_INITIAL_RTF: float = 0.3  # Until measured
+    ADMISSION_INITIAL_CHARS_PER_SECOND: float = 15.0  # Until measured
+
     class Config:
         env_file = ".env"
         extra = "ignore"
@@ -2,6 +2,7 @@ import logging
 import time
 from app.api.auth.models import ApiKey, UsageLog
 from app.core.config import settings
+from tortoise import Tortoise
 from tortoise.transactions import in_transaction
 
 logger = logging.getLogger("supertonic-api")
@@ -11,12 +12,33 @@ def get_db_config():
         "connections": {"default": "sqlite://db.sqlite3"},
         "apps": {
             "models": {
-                "models": ["app.api.auth.models"],
+                "models": ["app.api.auth.models", "app.api.jobs.models"],
                 "default_connection": "default",
             }
         },
     }
 
+# Columns added after the first release: (table, column, DDL type)
+_COLUMN_MIGRATIONS = [
+    ("apikey", "weight", "REAL NOT NULL DEFAULT 1.0"),
+    ("speechjob", "steps", "INT"),
+    ("speechjob", "owner", "VARCHAR(64)"),
+    ("speechjob", "lease_expires_at", "TIMESTAMP"),
+]
+
+async def migrate_schema():
+    """
+    Add columns introduced after a table was first created.
+    generate_schemas() only creates missing tables, it never alters existing ones.
+    """
+    conn = Tortoise.get_connection("default")
+    for table, column, ddl in _COLUMN_MIGRATIONS:
+        _, rows = await conn.execute_query(f"PRAGMA table_info({table})")
+        existing = {row["name"] for row in rows}
+        if existing and column not in existing:
+            logger.info(f"Migrating schema: adding {table}.{column}")
+            await conn.execute_script(f"ALTER TABLE {table} ADD COLUMN {column} {ddl}")
+
 class AuthError(Exception):
     def __init__(self, status_code, detail):
         self.status_code = status_code
@@ -36,12 +58,16 @@ async def verify_api_key(request):
     if len(parts) != 2 or parts[0].lower() != "bearer":
         raise AuthError(status_code=401, detail="Invalid Authorization header format. Expected 'Bearer <key>'")
 
-    token = parts[1]
-    
+    return await verify_token(parts[1])
+
+async def verify_token(token: str):
+    """
+    Returns the active ApiKey for a raw token.
+    """
     api_key = await ApiKey.get_or_none(key=token, is_active=True)
     if not api_key:
         raise AuthError(status_code=401, detail="Invalid or inactive API Key")
-        
+
     return api_key
 
 async def track_usage(api_key: ApiKey, chars_count: int, cost: float):
@@ -0,0 +1,71 @@
+"""
+Lightweight in-process metrics (counters, gauges and summaries).
+Exposed as JSON on the /metrics endpoint for tuning and dashboards.
+"""
+import threading
+from collections import defaultdict
+
+
+def _key(name: str, labels: dict) -> str:
+    if not labels:
+        return name
+    label_str = ",".join(f"{k}={v}" for k, v in sorted(labels.items()))
+    return f"{name}{{{label_str}}}"
+
+
+class Metrics:
+    """Thread-safe registry of named counters, gauges and summaries."""
+
+    def __init__(self):
+        self._lock = threading.Lock()
+        self._counters = defaultdict(float)
+        self._gauges = {}
+        self._summaries = {}
+
+    def inc(self, name: str, value: float = 1, **labels):
+        """Increment a counter."""
+        with self._lock:
+            self._counters[_key(name, labels)] += value
+
+    def set_gauge(self, name: str, value: float, **labels):
+        """Set a gauge to an absolute value."""
+        with self._lock:
+            self._gauges[_key(name, labels)] = value
+
+    def add_gauge(self, name: str, delta: float, **labels):
+        """Move a gauge up or down by delta."""
+        with self._lock:
+            key = _key(name, labels)
+            self._gauges[key] = self._gauges.get(key, 0) + delta
+
+    def observe(self, name: str, value: float, **labels):
+        """Record an observation (count, sum, min, max, last)."""
+        with self._lock:
+            key = _key(name, labels)
+            summary = self._summaries.get(key)
+            if summary is None:
+                self._summaries[key] = {
+                    "count": 1, "sum": value, "min": value, "max": value, "last": value,
+                }
+                return
+            summary["count"] += 1
+            summary["sum"] += value
+            summary["min"] = min(summary["min"], value)
+            summary["max"] = max(summary["max"], value)
+            summary["last"] = value
+
+    def snapshot(self) -> dict:
+        """Return a JSON-serializable copy of all metrics."""
+        with self._lock:
+            summaries = {}
+            for key, summary in self._summaries.items():
+                summaries[key] = dict(summary, avg=summary["sum"] / summary["count"])
+            return {
+                "counters": dict(self._counters),
+                "gauges": dict(self._gauges),
+                "summaries": summaries,
+            }
+
+
+# Singleton instance
+metrics = Metrics()
@@ -10,6 +10,9 @@ class AudioChunk:
     sample_rate: int
     text: str = ""
     output: Optional[bytes] = None
+    # Timing metadata for streamed chunks (milliseconds)
+    inference_ms: Optional[float] = None
+    encode_ms: Optional[float] = None
 
     @staticmethod
     def combine(chunks: List["AudioChunk"]) -> "AudioChunk":
@@ -7,10 +7,14 @@ from tortoise import Tortoise
 
 from app.core.config import settings
 from app.core.logging import setup_logging
+from app.core.metrics import metrics
 from app.services.tts import tts_service
+from app.services.jobs import speech_jobs
 from app.api import routes as tts_routes
+from app.api import realtime as realtime_routes
 from app.api.auth import routes as auth_routes
-from app.core.database import get_db_config, AuthError
+from app.api.jobs import routes as job_routes
+from app.core.database import get_db_config, migrate_schema, AuthError
 
 setup_logging()
 
@@ -22,9 +26,13 @@ async def lifespan(app: FastAPI):
     db_config = get_db_config()
     await Tortoise.init(config=db_config)
     await Tortoise.generate_schemas()
+    await migrate_schema()
     tts_service.initialize()
+    await speech_jobs.start()
     yield
     # Shutdown
+    await speech_jobs.stop()
+    tts_service.shutdown()
     await Tortoise.close_connections()
 
 
@@ -87,13 +95,42 @@ async def sitemap():
 @app.get("/health")
 async def health_check():
     """Health check endpoint for monitoring."""
-    status = "healthy" if tts_service.model else "initializing"
-    return {"status": status}
+    status = "healthy" if tts_service.is_ready else "initializing"
+    return {"status": status, "warmup": tts_service.warmup}
+
+
+@app.get("/health/live")
+async def liveness_check():
+    """Liveness probe: the process is up and serving HTTP."""
+    return {"status": "alive"}
+
+
+@app.get("/health/ready")
+async def readiness_check():
+    """Readiness probe: models are loaded and warmed up (or warm-up failed and they load lazily)."""
+    if tts_service.warmup["state"] == "failed":
+        status = "degraded"
+    else:
+        status = "ready" if tts_service.is_ready else tts_service.warmup["state"]
+    body = {
+        "status": status,
+        "warmup": tts_service.warmup,
+        "models": tts_service.registry.loaded_versions(),
+    }
+    return JSONResponse(status_code=200 if tts_service.is_ready else 503, content=body)
+
+
+@app.get("/metrics")
+async def metrics_snapshot():
+    """Expose in-process scheduler and pipeline metrics."""
+    return metrics.snapshot()
 
 
 # Include API routers
 app.include_router(tts_routes.router)
+app.include_router(realtime_routes.router)
 app.include_router(auth_routes.router)
+app.include_router(job_routes.router)
 
 
 if __name__ == "__main__":
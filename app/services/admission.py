@@ -0,0 +1,113 @@
+"""
+Cost-aware admission control.
+
+Each request's compute cost is estimated from its input length, the
+measured characters-per-audio-second and the measured real-time factor
+(RTF = inference seconds / audio seconds). A request is rejected up front
+when the queued work plus its own would not finish within the latency
+budget, instead of timing out behind the proxy later.
+"""
+import math
+import threading
+from dataclasses import dataclass
+from typing import Optional
+
+from app.core.config import settings
+from app.core.metrics import metrics
+
+
+@dataclass
+class Ticket:
+    """Admitted work, released when the request finishes."""
+    cost_s: float
+
+
+class AdmissionRejected(Exception):
+    def __init__(self, retry_after_s: int, expected_s: float):
+        self.retry_after_s = retry_after_s
+        self.expected_s = expected_s
+        super().__init__(f"Backlog too large: ~{expected_s:.1f}s expected")
+
+
+class AdmissionController:
+    """Tracks outstanding compute seconds and admits work within a latency budget."""
+
+    # Weight of the newest observation in the moving averages
+    ALPHA = 0.1
+
+    def __init__(
+        self,
+        latency_budget_s: float,
+        parallelism: int,
+        initial_rtf: float = 0.3,
+        initial_chars_per_second: float = 15.0,
+    ):
+        self.latency_budget_s = latency_budget_s
+        self.parallelism = max(1, parallelism)
+        self.rtf = initial_rtf
+        self.chars_per_second = initial_chars_per_second
+        self.outstanding_s = 0.0
+        self._lock = threading.Lock()
+
+    @staticmethod
+    def _step_scale(steps: Optional[int]) -> float:
+        # Denoising dominates inference, so cost is taken as proportional to steps
+        return (steps or settings.DENOISING_STEPS) / settings.DENOISING_STEPS
+
+    def rtf_for(self, steps: Optional[int] = None) -> float:
+        """Estimated real-time factor at a given denoising step count."""
+        return self.rtf * self._step_scale(steps)
+
+    def observe(
+        self, chars: int, audio_s: float, compute_s: float, speed: float = 1.0, steps: Optional[int] = None
+    ):
+        """Fold a finished inference batch into the RTF and speaking-rate estimates."""
+        if audio_s <= 0 or chars <= 0:
+            return
+        with self._lock:
+            # RTF is tracked at DENOISING_STEPS so quality tiers share one estimate
+            self.rtf += self.ALPHA * (compute_s / audio_s / self._step_scale(steps) - self.rtf)
+            # Speaking rate is tracked at speed 1.0
+            self.chars_per_second += self.ALPHA * (chars / (audio_s * speed) - self.chars_per_second)
+        metrics.set_gauge("admission_rtf", self.rtf)
+        metrics.set_gauge("admission_chars_per_second", self.chars_per_second)
+
+    def estimate(self, chars: int, speed: float = 1.0, steps: Optional[int] = None) -> float:
+        """Estimated compute seconds for a request of this length."""
+        audio_s = chars / max(self.chars_per_second, 1e-3) / max(speed, 0.25)
+        return audio_s * self.rtf_for(steps)
+
+    def admit(self, chars: int, speed: float = 1.0, steps: Optional[int] = None) -> Ticket:
+        """Reserve capacity for a request or raise AdmissionRejected."""
+        return self.reserve(self.estimate(chars, speed, steps))
+
+    def reserve(self, cost_s: float) -> Ticket:
+        """Reserve an already estimated cost, e.g. the sum over a batch's items."""
+        with self._lock:
+            expected_s = (self.outstanding_s + cost_s) / self.parallelism
+            # A lone request is always admitted, however long
+            if self.outstanding_s > 0 and expected_s > self.latency_budget_s:
+                retry_after = math.ceil(expected_s - self.latency_budget_s)
+                metrics.inc("admission_rejected")
+                raise AdmissionRejected(max(1, retry_after), expected_s)
+            self.outstanding_s += cost_s
+            metrics.set_gauge("admission_outstanding_seconds", self.outstanding_s)
+        metrics.inc("admission_accepted")
+        return Ticket(cost_s=cost_s)
+
+    def release(self, ticket: Optional[Ticket]):
+        """Return a finished request's reservation."""
+        if ticket is None:
+            return
+        with self._lock:
+            self.outstanding_s = max(0.0, self.outstanding_s - ticket.cost_s)
+            ticket.cost_s = 0.0
+            metrics.set_gauge("admission_outstanding_seconds", self.outstanding_s)
+
+
+admission = AdmissionController(
+    latency_budget_s=settings.ADMISSION_LATENCY_BUDGET_S,
+    parallelism=settings.ADMISSION_PARALLELISM or settings.INFERENCE_EXECUTOR_WORKERS or settings.MAX_WORKERS,
+    initial_rtf=settings.ADMISSION_INITIAL_RTF,
+    initial_chars_per_second=settings.ADMISSION_INITIAL_CHARS_PER_SECOND,
+) if settings.ADMISSION_ENABLED else None
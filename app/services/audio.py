@@ -4,6 +4,7 @@ from loguru import logger
 
 from app.core.config import settings
 from app.inference.base import AudioChunk
+from app.services.executors import encode_executor
 from app.services.streaming_audio_writer import StreamingAudioWriter
 
 
@@ -101,9 +102,6 @@ class AudioService:
         if output_format not in AudioService.SUPPORTED_FORMATS:
             raise ValueError(f"Format {output_format} not supported")
 
-        import asyncio
-        loop = asyncio.get_event_loop()
-
         def _process():
             nonlocal audio_chunk
             inner_normalizer = normalizer
@@ -131,7 +129,7 @@ class AudioService:
             return audio_chunk
 
         try:
-            return await loop.run_in_executor(None, _process)
+            return await encode_executor.run(_process)
         except Exception as e:
             logger.error(f"Error converting audio stream to {output_format}: {str(e)}")
             raise ValueError(f"Failed to convert audio stream to {output_format}: {str(e)}")
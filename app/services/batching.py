@@ -0,0 +1,180 @@
+import asyncio
+import bisect
+import time
+from dataclasses import dataclass, field
+from typing import Any, Awaitable, Callable, Dict, Hashable, List, Optional, Sequence, Tuple
+
+from app.core.logging import logger
+from app.core.metrics import metrics
+from app.services.deadlines import missed
+
+
+@dataclass
+class BatchItem:
+    """A single pending chunk waiting to be batched."""
+    text: str
+    future: asyncio.Future
+    context: Any = None
+    deadline: Optional[float] = None
+    enqueued_at: float = field(default_factory=time.monotonic)
+
+
+class BatchScheduler:
+    """
+    Dynamic micro-batching between chunk producers and the model.
+
+    Chunks submitted with the same key (model, style, speed) are collected
+    across requests until ``max_batch_size`` items are queued or the oldest
+    has waited ``max_wait_ms``, then run as one batch. Each submitter gets
+    back only its own result. The runner receives the key, the batch texts
+    and the context of the first item (e.g. the model and style to use).
+
+    Within a key, chunks are grouped into length buckets (``bucket_edges``
+    are upper bounds on text length) so short chunks are not padded to the
+    duration of long ones: a batched model call runs every item for the
+    longest item's duration. Aging rule: when a batch is dispatched with spare
+    room, items from neighbouring buckets that have waited at least
+    ``aging_ms`` ride along instead of waiting out their own window.
+
+    Items whose ``deadline`` (a ``time.monotonic()`` timestamp) has passed
+    by dispatch time fail with DeadlineExceeded instead of being run.
+    """
+
+    def __init__(
+        self,
+        runner: Callable[[Hashable, List[str], Any], Awaitable[List[Any]]],
+        max_batch_size: int = 8,
+        max_wait_ms: float = 5.0,
+        bucket_edges: Sequence[int] = (),
+        aging_ms: float = None,
+    ):
+        self.runner = runner
+        self.max_batch_size = max(1, max_batch_size)
+        self.max_wait_s = max(0.0, max_wait_ms) / 1000
+        self.bucket_edges = sorted(bucket_edges)
+        self.aging_s = self.max_wait_s / 2 if aging_ms is None else max(0.0, aging_ms) / 1000
+        self._queues: Dict[Tuple[Hashable, int], List[BatchItem]] = {}
+        self._timers: Dict[Tuple[Hashable, int], asyncio.TimerHandle] = {}
+
+    def bucket_for(self, text: str) -> int:
+        """Index of the length bucket a chunk falls into."""
+        return bisect.bisect_left(self.bucket_edges, len(text))
+
+    @property
+    def queued(self) -> int:
+        return sum(len(q) for q in self._queues.values())
+
+    async def submit(
+        self, key: Hashable, text: str, context: Any = None, deadline: Optional[float] = None
+    ) -> Any:
+        """Queue a chunk and wait for its batched result."""
+        loop = asyncio.get_running_loop()
+        item = BatchItem(text=text, future=loop.create_future(), context=context, deadline=deadline)
+        bucket_key = (key, self.bucket_for(text))
+        self._queues.setdefault(bucket_key, []).append(item)
+        metrics.set_gauge("batch_queue_depth", self.queued)
+
+        if len(self._queues[bucket_key]) >= self.max_batch_size or self.max_wait_s == 0:
+            self._flush(bucket_key)
+        elif bucket_key not in self._timers:
+            self._timers[bucket_key] = loop.call_later(self.max_wait_s, self._flush, bucket_key)
+
+        try:
+            return await item.future
+        except asyncio.CancelledError:
+            self._discard(bucket_key, item)
+            raise
+
+    def _take_aged(self, bucket_key: Tuple[Hashable, int], room: int) -> List[BatchItem]:
+        """Pull aged items from neighbouring buckets of the same key, nearest first."""
+        key, bucket = bucket_key
+        now = time.monotonic()
+        taken = []
+        for distance in range(1, len(self.bucket_edges) + 1):
+            for neighbour in ((key, bucket - distance), (key, bucket + distance)):
+                queue = self._queues.get(neighbour)
+                while queue and room > 0 and now - queue[0].enqueued_at >= self.aging_s:
+                    taken.append(queue.pop(0))
+                    room -= 1
+                if neighbour in self._queues and not queue:
+                    self._queues.pop(neighbour, None)
+                    timer = self._timers.pop(neighbour, None)
+                    if timer:
+                        timer.cancel()
+                if room == 0:
+                    return taken
+        return taken
+
+    def _discard(self, key: Tuple[Hashable, int], item: BatchItem):
+        """Drop a cancelled item that has not been dispatched yet."""
+        queue = self._queues.get(key)
+        if queue and item in queue:
+            queue.remove(item)
+            if not queue:
+                self._queues.pop(key, None)
+                timer = self._timers.pop(key, None)
+                if timer:
+                    timer.cancel()
+            metrics.set_gauge("batch_queue_depth", self.queued)
+
+    def _flush(self, key: Tuple[Hashable, int]):
+        """Dispatch up to max_batch_size queued items for a bucket."""
+        timer = self._timers.pop(key, None)
+        if timer:
+            timer.cancel()
+
+        queue = self._queues.get(key)
+        if not queue:
+            return
+
+        batch = queue[:self.max_batch_size]
+        del queue[:self.max_batch_size]
+        if queue:
+            # Leftovers start a fresh wait window
+            loop = asyncio.get_running_loop()
+            self._timers[key] = loop.call_later(self.max_wait_s, self._flush, key)
+        else:
+            self._queues.pop(key, None)
+        if len(batch) < self.max_batch_size and self.bucket_edges:
+            batch.extend(self._take_aged(key, self.max_batch_size - len(batch)))
+        metrics.set_gauge("batch_queue_depth", self.queued)
+
+        asyncio.ensure_future(self._run(key[0], batch))
+
+    async def _run(self, key: Hashable, batch: List[BatchItem]):
+        """Run one batch and resolve each item's future."""
+        now = time.monotonic()
+        live = []
+        for item in batch:
+            if item.future.done():
+                continue
+            if item.deadline is not None and now >= item.deadline:
+                item.future.set_exception(missed("batch"))
+                continue
+            live.append(item)
+        batch = live
+        if not batch:
+            return
+
+        for item in batch:
+            metrics.observe("batch_queue_wait_ms", (now - item.enqueued_at) * 1000)
+        metrics.observe("batch_size", len(batch))
+        metrics.observe("batch_fill_ratio", len(batch) / self.max_batch_size)
+        # Text-length estimate; the runner reports the audio-duration padding
+        longest = max(len(item.text) for item in batch)
+        if longest:
+            padded = longest * len(batch)
+            metrics.observe("batch_padding_ratio", 1 - sum(len(item.text) for item in batch) / padded)
+
+        try:
+            results = await self.runner(key, [item.text for item in batch], batch[0].context)
+        except Exception as e:
+            logger.error(f"Batch inference failed ({len(batch)} items): {e}")
+            for item in batch:
+                if not item.future.done():
+                    item.future.set_exception(e)
+            return
+
+        for item, result in zip(batch, results):
+            if not item.future.done():
+                item.future.set_result(result)
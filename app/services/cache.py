@@ -0,0 +1,190 @@
+"""
+Content-addressed cache of complete encoded responses.
+
+Two tiers: a size-bounded in-memory LRU and an on-disk tier of plain files
+(read back through mmap) that survives restarts. Keys are a hash of
+everything that determines the output bytes.
+"""
+import hashlib
+import json
+import mmap
+import os
+import threading
+from collections import OrderedDict
+from typing import Optional
+
+from app.core.config import settings
+from app.core.logging import logger
+from app.core.metrics import metrics
+from app.services.ort_session import INT8_SUFFIX
+
+
+def _quantization(model_version: str) -> str:
+    """Quantization mode a model version is served with."""
+    if settings.INT8_QUANTIZATION or model_version.endswith(INT8_SUFFIX):
+        return "int8:" + ",".join(settings.INT8_OP_TYPES)
+    return "fp32"
+
+
+def make_cache_key(
+    text: str,
+    voice: str,
+    speed: float,
+    model_version: str,
+    response_format: str,
+    **extra,
+) -> str:
+    """Hash the synthesis inputs and audio settings that shape the output."""
+    payload = {
+        "text": text,
+        "voice": voice,
+        "speed": round(float(speed), 4),
+        "model": model_version,
+        # INT8_QUANTIZATION runs plain versions quantized, which changes the audio
+        "quantization": _quantization(model_version),
+        "format": response_format,
+        "sample_rate": settings.SAMPLE_RATE,
+        "gap_trim_ms": settings.gap_trim_ms,
+        "padding_ms": settings.dynamic_gap_trim_padding_ms,
+        "padding_mult": settings.dynamic_gap_trim_padding_char_multiplier,
+        **extra,
+    }
+    raw = json.dumps(payload, sort_keys=True, ensure_ascii=False).encode("utf-8")
+    return hashlib.sha256(raw).hexdigest()
+
+
+class ResponseCache:
+    """Memory LRU in front of a disk tier, both bounded in bytes."""
+
+    def __init__(self, memory_mb: float, disk_dir: str = "", disk_mb: float = 0):
+        self.memory_limit = int(memory_mb * 1024 * 1024)
+        self.disk_limit = int(disk_mb * 1024 * 1024)
+        self.disk_dir = disk_dir if disk_dir and disk_mb > 0 else ""
+        self._memory: "OrderedDict[str, bytes]" = OrderedDict()
+        self._memory_bytes = 0
+        self._disk_bytes = 0
+        self._lock = threading.Lock()
+        if self.disk_dir:
+            os.makedirs(self.disk_dir, exist_ok=True)
+            self._disk_bytes = sum(
+                os.path.getsize(os.path.join(self.disk_dir, name))
+                for name in os.listdir(self.disk_dir)
+                if not name.endswith(".tmp")
+            )
+
+    def _path(self, key: str) -> str:
+        return os.path.join(self.disk_dir, key)
+
+    def _put_memory(self, key: str, data: bytes):
+        if len(data) > self.memory_limit:
+            return
+        with self._lock:
+            old = self._memory.pop(key, None)
+            if old is not None:
+                self._memory_bytes -= len(old)
+            self._memory[key] = data
+            self._memory_bytes += len(data)
+            while self._memory_bytes > self.memory_limit:
+                _, evicted = self._memory.popitem(last=False)
+                self._memory_bytes -= len(evicted)
+            metrics.set_gauge("response_cache_memory_bytes", self._memory_bytes)
+
+    def _read_disk(self, key: str) -> Optional[bytes]:
+        path = self._path(key)
+        try:
+            with open(path, "rb") as f:
+                with mmap.mmap(f.fileno(), 0, access=mmap.ACCESS_READ) as mm:
+                    data = mm[:]
+            os.utime(path)  # Refresh LRU position
+            return data
+        except (FileNotFoundError, ValueError):
+            return None
+        except OSError as e:
+            logger.warning(f"Response cache read failed for {key}: {e}")
+            return None
+
+    def _write_disk(self, key: str, data: bytes):
+        if len(data) > self.disk_limit:
+            return
+        path = self._path(key)
+        if os.path.exists(path):
+            return
+        tmp_path = f"{path}.{threading.get_ident()}.tmp"
+        try:
+            with open(tmp_path, "wb") as f:
+                f.write(data)
+            os.replace(tmp_path, path)
+        except OSError as e:
+            logger.warning(f"Response cache write failed for {key}: {e}")
+            return
+        with self._lock:
+            self._disk_bytes += len(data)
+            if self._disk_bytes > self.disk_limit:
+                self._evict_disk()
+            metrics.set_gauge("response_cache_disk_bytes", self._disk_bytes)
+
+    def _evict_disk(self):
+        """Remove least recently used files until under the disk budget. Caller holds _lock."""
+        entries = []
+        for name in os.listdir(self.disk_dir):
+            if name.endswith(".tmp"):
+                continue
+            path = os.path.join(self.disk_dir, name)
+            try:
+                stat = os.stat(path)
+            except OSError:
+                continue
+            entries.append((stat.st_mtime, stat.st_size, path))
+        entries.sort()
+        for _, size, path in entries:
+            if self._disk_bytes <= self.disk_limit:
+                break
+            try:
+                os.remove(path)
+                self._disk_bytes -= size
+            except OSError:
+                pass
+
+    def get(self, key: str) -> Optional[bytes]:
+        """Look up a response in memory, then on disk (blocking on disk I/O)."""
+        with self._lock:
+            data = self._memory.get(key)
+            if data is not None:
+                self._memory.move_to_end(key)
+        if data is not None:
+            metrics.inc("response_cache_hits", tier="memory")
+            metrics.inc("response_cache_bytes_saved", len(data))
+            return data
+
+        if self.disk_dir:
+            data = self._read_disk(key)
+            if data is not None:
+                self._put_memory(key, data)
+                metrics.inc("response_cache_hits", tier="disk")
+                metrics.inc("response_cache_bytes_saved", len(data))
+                return data
+
+        metrics.inc("response_cache_misses")
+        return None
+
+    def contains(self, key: str) -> bool:
+        """True if a complete response is stored for key (blocking on a disk stat)."""
+        with self._lock:
+            if key in self._memory:
+                return True
+        return bool(self.disk_dir) and os.path.exists(self._path(key))
+
+    def put(self, key: str, data: bytes):
+        """Store a complete response in both tiers (blocking on disk I/O)."""
+        if not data:
+            return
+        self._put_memory(key, data)
+        if self.disk_dir:
+            self._write_disk(key, data)
+
+
+response_cache = ResponseCache(
+    memory_mb=settings.RESPONSE_CACHE_MEMORY_MB,
+    disk_dir=settings.RESPONSE_CACHE_DIR,
+    disk_mb=settings.RESPONSE_CACHE_DISK_MB,
+) if settings.RESPONSE_CACHE_ENABLED else None
@@ -0,0 +1,112 @@
+"""
+Single-flight coalescing of identical in-flight synthesis requests.
+
+The first request for a key (the leader) starts one producer; identical
+requests arriving while it runs (followers) attach to it. Every subscriber
+gets the chunks produced so far replayed, then the live tail.
+
+The producer runs without a deadline, since its subscribers may each carry
+a different one. A subscriber gives up when its own deadline passes, and
+the producer is cancelled once nobody follows it any more.
+"""
+import asyncio
+from typing import AsyncIterator, Callable, Dict, List, Optional
+
+from app.core.logging import logger
+from app.core.metrics import metrics
+from app.services.deadlines import missed, time_left
+
+
+class _Flight:
+    """One in-flight producer and the chunks it has emitted so far."""
+
+    def __init__(self):
+        self.chunks: List[bytes] = []
+        self.done = False
+        self.error: Optional[BaseException] = None
+        self.subscribers = 0
+        self.task: Optional[asyncio.Task] = None
+        self._changed = asyncio.Event()
+
+    def publish(self):
+        changed, self._changed = self._changed, asyncio.Event()
+        changed.set()
+
+    async def follow(self, deadline: Optional[float] = None) -> AsyncIterator[bytes]:
+        index = 0
+        while True:
+            changed = self._changed
+            while index < len(self.chunks):
+                yield self.chunks[index]
+                index += 1
+            if self.done:
+                if self.error is not None:
+                    raise self.error
+                return
+            try:
+                await asyncio.wait_for(changed.wait(), timeout=time_left(deadline))
+            except asyncio.TimeoutError:
+                raise missed("coalesced")
+
+
+class SingleFlight:
+    """Shares one producer per key among all concurrent subscribers."""
+
+    def __init__(self):
+        self._flights: Dict[str, _Flight] = {}
+
+    async def _produce(self, key: str, flight: _Flight, source: AsyncIterator[bytes]):
+        try:
+            async for chunk in source:
+                flight.chunks.append(chunk)
+                flight.publish()
+        except asyncio.CancelledError:
+            flight.error = RuntimeError("Synthesis cancelled")
+        except Exception as e:
+            logger.error(f"Coalesced synthesis failed: {e}")
+            flight.error = e
+        finally:
+            aclose = getattr(source, "aclose", None)
+            if aclose is not None:
+                await aclose()
+            flight.done = True
+            flight.publish()
+            if self._flights.get(key) is flight:
+                del self._flights[key]
+
+    def in_flight(self, key: str) -> bool:
+        """True if a producer for key is running and can be joined."""
+        return key in self._flights
+
+    async def subscribe(
+        self, key: str, factory: Callable[[], AsyncIterator[bytes]], deadline: Optional[float] = None
+    ) -> AsyncIterator[bytes]:
+        """Yield the output for key, starting a producer only if none is in flight.
+
+        Raises DeadlineExceeded if ``deadline`` passes while waiting for the
+        next chunk; the producer carries on for any other subscribers.
+        """
+        flight = self._flights.get(key)
+        if flight is None:
+            flight = _Flight()
+            self._flights[key] = flight
+            flight.task = asyncio.ensure_future(self._produce(key, flight, factory()))
+            metrics.inc("singleflight_leaders")
+        else:
+            metrics.inc("singleflight_followers")
+
+        flight.subscribers += 1
+        try:
+            async for chunk in flight.follow(deadline):
+                yield chunk
+        finally:
+            flight.subscribers -= 1
+            if flight.subscribers == 0 and not flight.done:
+                # Nobody is listening any more; later requests must start afresh
+                if self._flights.get(key) is flight:
+                    del self._flights[key]
+                flight.task.cancel()
+
+
+# Singleton instance
+single_flight = SingleFlight()
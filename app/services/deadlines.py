@@ -0,0 +1,44 @@
+"""
+Per-request deadlines.
+
+A deadline is an absolute ``time.monotonic()`` timestamp carried with a
+request's work. Each pipeline stage checks it before doing anything
+expensive and drops expired work instead of synthesizing audio nobody is
+waiting for any more.
+"""
+import time
+from typing import Optional
+
+from app.core.metrics import metrics
+
+
+class DeadlineExceeded(Exception):
+    def __init__(self, stage: str):
+        self.stage = stage
+        super().__init__(f"Request deadline exceeded ({stage})")
+
+
+def deadline_after(timeout_s: Optional[float]) -> Optional[float]:
+    """Absolute deadline for a timeout in seconds; None or <= 0 means no deadline."""
+    if not timeout_s or timeout_s <= 0:
+        return None
+    return time.monotonic() + timeout_s
+
+
+def time_left(deadline: Optional[float]) -> Optional[float]:
+    """Seconds until the deadline, or None if there is none."""
+    if deadline is None:
+        return None
+    return max(0.0, deadline - time.monotonic())
+
+
+def missed(stage: str) -> DeadlineExceeded:
+    """Count a deadline miss for a stage and return the error to raise."""
+    metrics.inc("deadline_missed", stage=stage)
+    return DeadlineExceeded(stage)
+
+
+def check_deadline(deadline: Optional[float], stage: str):
+    """Raise DeadlineExceeded if the deadline has passed."""
+    if deadline is not None and time.monotonic() >= deadline:
+        raise missed(stage)
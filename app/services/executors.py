@@ -0,0 +1,83 @@
+"""
+Dedicated thread pools per pipeline stage.
+
+Inference and encoding run on separate, separately sized executors so a
+short encode never waits behind a long synthesis (and vice versa). Each
+stage publishes queue-depth and busy-worker gauges.
+"""
+import asyncio
+import threading
+from concurrent.futures import ThreadPoolExecutor
+from typing import Any, Callable
+
+from app.core.config import settings
+from app.core.metrics import metrics
+
+
+class StageExecutor:
+    """Thread pool for one pipeline stage with queue and busy gauges."""
+
+    def __init__(self, name: str, max_workers: int):
+        self.name = name
+        self.max_workers = max(1, max_workers)
+        self._pool = ThreadPoolExecutor(max_workers=self.max_workers, thread_name_prefix=name)
+        self._lock = threading.Lock()
+        self._queued = 0
+        self._busy = 0
+        metrics.set_gauge("executor_workers", self.max_workers, stage=name)
+        self._publish()
+
+    def _publish(self):
+        metrics.set_gauge("executor_queue_depth", self._queued, stage=self.name)
+        metrics.set_gauge("executor_busy_workers", self._busy, stage=self.name)
+
+    async def run(self, fn: Callable, *args) -> Any:
+        """Run fn(*args) on this stage's pool."""
+        loop = asyncio.get_running_loop()
+        started = False
+        abandoned = False
+
+        def _call():
+            nonlocal started
+            with self._lock:
+                started = True
+                if not abandoned:
+                    self._queued -= 1
+                self._busy += 1
+                self._publish()
+            try:
+                return fn(*args)
+            finally:
+                with self._lock:
+                    self._busy -= 1
+                    self._publish()
+
+        with self._lock:
+            self._queued += 1
+            self._publish()
+        try:
+            return await loop.run_in_executor(self._pool, _call)
+        except asyncio.CancelledError:
+            with self._lock:
+                if not started:
+                    abandoned = True
+                    self._queued -= 1
+                    self._publish()
+            raise
+
+    def shutdown(self):
+        self._pool.shutdown(wait=False, cancel_futures=True)
+
+
+inference_executor = StageExecutor(
+    "inference", settings.INFERENCE_EXECUTOR_WORKERS or settings.MAX_WORKERS
+)
+encode_executor = StageExecutor(
+    "encode", settings.ENCODE_EXECUTOR_WORKERS or settings.MAX_WORKERS
+)
+
+
+def shutdown_executors():
+    """Stop all stage executors."""
+    inference_executor.shutdown()
+    encode_executor.shutdown()
@@ -0,0 +1,367 @@
+"""
+Background runner for long-form speech jobs.
+
+Jobs are persisted in the database (SpeechJob) and processed oldest first.
+Each chunk's trimmed PCM is appended to a spool file on disk and the job
+row records how many chunks and bytes are done, so after a restart a job
+continues from its last finished chunk. Once every chunk is spooled the
+PCM is encoded to the requested format, block by block, into the output
+file. Chunks pass admission control one at a time and wait, rather than
+fail, while interactive requests fill the latency budget.
+
+Several server processes can share the database. A runner claims a job by
+writing its owner id and a lease, renews the lease while it works and only
+writes to rows it still owns, so a job cancelled (or taken over after a
+lapsed lease) from another process stops at its next chunk.
+"""
+import asyncio
+import os
+import shutil
+import socket
+import uuid
+from collections import deque
+from datetime import datetime, timedelta, timezone
+from typing import Dict, Optional
+
+import numpy as np
+from tortoise.expressions import Q
+
+from app.api.jobs.models import SpeechJob
+from app.core.config import settings
+from app.core.logging import logger
+from app.core.metrics import metrics
+from app.services.admission import admission, AdmissionRejected, Ticket
+from app.services.streaming_audio_writer import StreamingAudioWriter
+from app.services.tts import tts_service
+from app.utils.text import smart_split
+
+# Samples per block when encoding the spool into the final file
+_ENCODE_BLOCK_SAMPLES = 1 << 16
+
+
+class _JobLost(Exception):
+    """The job was cancelled or handed to another runner while this one worked on it."""
+
+
+async def _silence(samples: int) -> np.ndarray:
+    return np.zeros(samples, dtype=np.int16)
+
+
+def _append(path: str, data: bytes):
+    with open(path, "ab") as f:
+        f.write(data)
+        f.flush()
+        os.fsync(f.fileno())
+
+
+async def _admit(chars: int, speed: float, steps: Optional[int]) -> Optional[Ticket]:
+    """Reserve capacity for one chunk, waiting while interactive requests fill the budget."""
+    if admission is None:
+        return None
+    while True:
+        try:
+            return admission.admit(chars, speed, steps)
+        except AdmissionRejected as e:
+            await asyncio.sleep(e.retry_after_s)
+
+
+def _restore_spool(path: str, size: int) -> bool:
+    """Cut the spool back to the bytes recorded as finished.
+
+    Bytes of a chunk that was not recorded are dropped. Returns False (and
+    starts an empty spool) when fewer bytes than recorded are on disk, e.g.
+    the file was lost, since the earlier chunks would be missing.
+    """
+    if size > 0 and os.path.exists(path) and os.path.getsize(path) >= size:
+        with open(path, "r+b") as f:
+            f.truncate(size)
+        return True
+    open(path, "wb").close()
+    return size == 0
+
+
+def _remove_file(path: str):
+    try:
+        os.remove(path)
+    except FileNotFoundError:
+        pass
+
+
+def _encode_spool(spool_path: str, output_path: str, response_format: str, sample_rate: int):
+    """Encode spooled int16 PCM into the final file without loading it all at once.
+
+    The spool is left in place; it is removed only once the job is recorded
+    as completed, so a crash in between re-encodes instead of losing audio.
+    """
+    tmp_path = f"{output_path}.tmp"
+    if response_format == "pcm":
+        shutil.copyfile(spool_path, tmp_path)
+        os.replace(tmp_path, output_path)
+        return
+    writer = StreamingAudioWriter(format=response_format, sample_rate=sample_rate)
+    try:
+        with open(spool_path, "rb") as src, open(tmp_path, "wb") as dst:
+            while True:
+                block = src.read(_ENCODE_BLOCK_SAMPLES * 2)
+                if not block:
+                    break
+                dst.write(writer.write_chunk(np.frombuffer(block, dtype=np.int16)))
+            dst.write(writer.write_chunk(finalize=True))
+    finally:
+        writer.close()
+    os.replace(tmp_path, output_path)
+
+
+class SpeechJobRunner:
+    """Claims queued jobs and runs up to ``concurrency`` of them at a time."""
+
+    def __init__(
+        self, directory: str, concurrency: int = 1, retention_hours: float = 24, lease_s: float = 60
+    ):
+        self.directory = directory
+        self.concurrency = max(1, concurrency)
+        self.retention = timedelta(hours=retention_hours)
+        self.lease = timedelta(seconds=lease_s)
+        self.owner = f"{socket.gethostname()[:32]}:{os.getpid()}:{uuid.uuid4().hex[:8]}"
+        self._running: Dict[str, asyncio.Task] = {}
+        self._wakeup = asyncio.Event()
+        self._loop_task: Optional[asyncio.Task] = None
+
+    def spool_path(self, job_id) -> str:
+        return os.path.join(self.directory, f"{job_id}.spool")
+
+    def output_path(self, job: SpeechJob) -> str:
+        return os.path.join(self.directory, f"{job.id}.{job.response_format}")
+
+    async def start(self):
+        """Requeue jobs whose runner went away and start the dispatch loop."""
+        os.makedirs(self.directory, exist_ok=True)
+        self._loop_task = asyncio.create_task(self._dispatch_loop())
+
+    async def stop(self):
+        """Stop work; running jobs are requeued and resume from their last finished chunk."""
+        if self._loop_task is not None:
+            self._loop_task.cancel()
+        tasks = list(self._running.values())
+        for task in tasks:
+            task.cancel()
+        await asyncio.gather(*tasks, return_exceptions=True)
+        # Hand the jobs back now rather than when their lease runs out
+        await SpeechJob.filter(status="running", owner=self.owner).update(
+            status="queued", owner=None, lease_expires_at=None
+        )
+
+    def notify(self):
+        """Wake the dispatcher after a job was submitted or finished."""
+        self._wakeup.set()
+
+    async def cancel(self, job: SpeechJob):
+        """Cancel a job and delete its files.
+
+        A job running in another process stops at its next chunk, when that
+        runner finds it no longer owns the row.
+        """
+        task = self._running.get(str(job.id))
+        if task is not None:
+            task.cancel()
+            await asyncio.gather(task, return_exceptions=True)
+        cancelled = await SpeechJob.filter(id=job.id, status__in=["queued", "running"]).update(
+            status="cancelled", owner=None, lease_expires_at=None, finished_at=datetime.now(timezone.utc)
+        )
+        if cancelled:
+            self._remove_files(job)
+
+    async def delete(self, job: SpeechJob):
+        """Delete a finished job and its files."""
+        await job.delete()
+        self._remove_files(job)
+
+    def _remove_files(self, job: SpeechJob):
+        for path in (self.spool_path(job.id), self.output_path(job)):
+            _remove_file(path)
+
+    async def _dispatch_loop(self):
+        # Wake often enough to renew leases well before they run out
+        interval = min(5.0, self.lease.total_seconds() / 3)
+        while True:
+            try:
+                await self._renew_leases()
+                await self._requeue_expired()
+                while len(self._running) < self.concurrency:
+                    job = await SpeechJob.filter(status="queued").order_by("created_at").first()
+                    if job is None:
+                        break
+                    # Claim atomically in case several server processes share the database
+                    claimed = await SpeechJob.filter(id=job.id, status="queued").update(
+                        status="running", owner=self.owner, lease_expires_at=self._lease_end()
+                    )
+                    if not claimed:
+                        continue
+                    job.status = "running"
+                    job_id = str(job.id)
+                    task = asyncio.create_task(self._run(job))
+                    self._running[job_id] = task
+                    task.add_done_callback(lambda _, job_id=job_id: self._finished(job_id))
+                await self._expire_old_jobs()
+            except asyncio.CancelledError:
+                raise
+            except Exception as e:
+                logger.error(f"Speech job dispatch failed: {e}")
+
+            try:
+                await asyncio.wait_for(self._wakeup.wait(), timeout=interval)
+            except asyncio.TimeoutError:
+                pass
+            self._wakeup.clear()
+
+    def _finished(self, job_id: str):
+        self._running.pop(job_id, None)
+        self.notify()
+
+    def _lease_end(self) -> datetime:
+        return datetime.now(timezone.utc) + self.lease
+
+    async def _renew_leases(self):
+        """Extend the lease of every job this runner is working on."""
+        if self._running:
+            await SpeechJob.filter(
+                id__in=list(self._running), status="running", owner=self.owner
+            ).update(lease_expires_at=self._lease_end())
+
+    async def _requeue_expired(self):
+        """Requeue running jobs whose runner stopped renewing its lease, e.g. a crashed process."""
+        requeued = await SpeechJob.filter(status="running").filter(
+            Q(lease_expires_at__isnull=True) | Q(lease_expires_at__lt=datetime.now(timezone.utc))
+        ).update(status="queued", owner=None, lease_expires_at=None)
+        if requeued:
+            logger.info(f"Resuming {requeued} interrupted speech job(s)")
+
+    async def _update_owned(self, job: SpeechJob, **fields):
+        """Write fields of a job this runner still owns, renewing its lease.
+
+        Raises _JobLost once the job was cancelled or requeued, so a job is
+        never written back over another process's change.
+        """
+        now = datetime.now(timezone.utc)
+        fields.setdefault("lease_expires_at", now + self.lease)
+        updated = await SpeechJob.filter(id=job.id, status="running", owner=self.owner).update(
+            updated_at=now, **fields
+        )
+        if not updated:
+            raise _JobLost()
+
+    async def _abandon(self, job: SpeechJob):
+        """Stop a job this runner lost; delete its files unless another runner has it."""
+        if await SpeechJob.filter(id=job.id, status__in=["queued", "running"]).exists():
+            logger.warning(f"Speech job {job.id} was taken over by another runner")
+            return
+        # Writes that raced the cancel may have recreated the spool
+        self._remove_files(job)
+        logger.info(f"Speech job {job.id} stopped: cancelled")
+
+    async def _expire_old_jobs(self):
+        cutoff = datetime.now(timezone.utc) - self.retention
+        for job in await SpeechJob.filter(
+            status__in=["completed", "failed", "cancelled"], finished_at__lt=cutoff
+        ):
+            await self.delete(job)
+
+    async def _run(self, job: SpeechJob):
+        loop = asyncio.get_running_loop()
+        spool = self.spool_path(job.id)
+        try:
+            await job.fetch_related("api_key")
+            ctx = await tts_service.stream_context(
+                job.voice, job.speed, job.model_version,
+                tenant=str(job.api_key.id), weight=job.api_key.weight, steps=job.steps,
+            )
+            job.sample_rate = ctx.model.sample_rate
+            entries = [
+                (chunk_text, pause)
+                async for chunk_text, _, pause in smart_split(job.text, job.max_chunk_length)
+                if pause or chunk_text.strip()
+            ]
+            job.total_chunks = len(entries)
+            restored = await loop.run_in_executor(None, _restore_spool, spool, job.spooled_bytes)
+            if not restored:
+                logger.warning(
+                    f"Speech job {job.id} spool is missing audio for {job.completed_chunks} "
+                    "finished chunks, starting over"
+                )
+                job.completed_chunks = 0
+                job.spooled_bytes = 0
+            await self._update_owned(
+                job,
+                sample_rate=job.sample_rate,
+                total_chunks=job.total_chunks,
+                completed_chunks=job.completed_chunks,
+                spooled_bytes=job.spooled_bytes,
+            )
+            if job.completed_chunks:
+                logger.info(f"Speech job {job.id} resuming at chunk {job.completed_chunks}/{job.total_chunks}")
+
+            depth = max(1, settings.PIPELINE_DEPTH)
+            pending = deque()
+            next_index = job.completed_chunks
+            try:
+                while job.completed_chunks < job.total_chunks:
+                    while next_index < job.total_chunks and len(pending) < depth:
+                        chunk_text, pause = entries[next_index]
+                        if pause:
+                            future = asyncio.ensure_future(_silence(int(pause * job.sample_rate)))
+                        else:
+                            ticket = await _admit(len(chunk_text), job.speed, job.steps)
+                            future = asyncio.ensure_future(tts_service.synthesize_chunk(chunk_text, ctx))
+                            if ticket is not None:
+                                future.add_done_callback(lambda _, ticket=ticket: admission.release(ticket))
+                        pending.append(future)
+                        next_index += 1
+
+                    pcm = await pending.popleft()
+                    if pcm is None:
+                        raise RuntimeError(f"Chunk {job.completed_chunks} failed to synthesize")
+                    data = pcm.astype(np.int16, copy=False).tobytes()
+                    await loop.run_in_executor(None, _append, spool, data)
+                    job.completed_chunks += 1
+                    job.spooled_bytes += len(data)
+                    # Progress only; saving the whole row would rewrite the text every chunk.
+                    # Also where a cancel from another process is noticed.
+                    await self._update_owned(
+                        job, completed_chunks=job.completed_chunks, spooled_bytes=job.spooled_bytes
+                    )
+            finally:
+                for future in pending:
+                    future.cancel()
+
+            await loop.run_in_executor(
+                None, _encode_spool, spool, self.output_path(job), job.response_format, job.sample_rate
+            )
+            await self._update_owned(
+                job, status="completed", finished_at=datetime.now(timezone.utc), lease_expires_at=None
+            )
+            await loop.run_in_executor(None, _remove_file, spool)
+            metrics.inc("speech_jobs", status="completed")
+            logger.info(f"Speech job {job.id} completed ({job.total_chunks} chunks)")
+        except asyncio.CancelledError:
+            raise
+        except _JobLost:
+            await self._abandon(job)
+        except Exception as e:
+            logger.error(f"Speech job {job.id} failed: {e}")
+            try:
+                await self._update_owned(
+                    job, status="failed", error=str(e),
+                    finished_at=datetime.now(timezone.utc), lease_expires_at=None,
+                )
+            except _JobLost:
+                await self._abandon(job)
+                return
+            metrics.inc("speech_jobs", status="failed")
+
+
+speech_jobs = SpeechJobRunner(
+    directory=settings.SPEECH_JOB_DIR,
+    concurrency=settings.SPEECH_JOB_WORKERS,
+    retention_hours=settings.SPEECH_JOB_RETENTION_HOURS,
+    lease_s=settings.SPEECH_JOB_LEASE_S,
+)
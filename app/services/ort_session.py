@@ -0,0 +1,174 @@
+"""
+ONNX Runtime session tuning and optimized-graph cache.
+
+Every InferenceSession the model creates gets SessionOptions from Settings
+(graph optimization level, memory arena and pattern, execution mode). On
+CPU the graph ORT optimizes at load is also saved to ORT_OPTIMIZED_MODEL_DIR;
+later starts load that file with optimization disabled instead of
+re-optimizing. Saved graphs may contain hardware-specific kernels, so the
+cache key covers the source file, the ORT version, the optimization level
+and the machine.
+
+Sessions created inside ``int8_sessions()`` load dynamically quantized INT8
+copies of the model files, produced once and stored next to the originals.
+"""
+import hashlib
+import os
+import platform
+import threading
+import time
+from contextlib import contextmanager
+from typing import List, Optional, Tuple
+
+import onnxruntime as ort
+
+from app.core.config import settings
+from app.core.logging import logger
+from app.core.metrics import metrics
+
+_OPTIMIZATION_LEVELS = {
+    "disable": ort.GraphOptimizationLevel.ORT_DISABLE_ALL,
+    "basic": ort.GraphOptimizationLevel.ORT_ENABLE_BASIC,
+    "extended": ort.GraphOptimizationLevel.ORT_ENABLE_EXTENDED,
+    "all": ort.GraphOptimizationLevel.ORT_ENABLE_ALL,
+}
+
+_EXECUTION_MODES = {
+    "sequential": ort.ExecutionMode.ORT_SEQUENTIAL,
+    "parallel": ort.ExecutionMode.ORT_PARALLEL,
+}
+
+# Model versions and API model names with this suffix run INT8-quantized
+INT8_SUFFIX = "-int8"
+
+# Models load on executor threads; the flag covers sessions created by the current load
+_loading = threading.local()
+
+
+@contextmanager
+def int8_sessions(enabled: bool = True):
+    """Within this block, new sessions load INT8-quantized model files."""
+    previous = getattr(_loading, "int8", False)
+    _loading.int8 = enabled
+    try:
+        yield
+    finally:
+        _loading.int8 = previous
+
+
+def quantized_model_path(model_path: str) -> str:
+    """INT8 copy of an ONNX file, quantized on first use; the original if that fails."""
+    stem, ext = os.path.splitext(model_path)
+    target = f"{stem}.int8{ext}"
+    if os.path.exists(target):
+        return target
+    try:
+        from onnxruntime.quantization import QuantType, quantize_dynamic
+    except ImportError as e:
+        logger.warning(f"INT8 quantization needs the onnx package ({e}); using {model_path}")
+        return model_path
+
+    tmp_path = f"{stem}.{os.getpid()}.tmp{ext}"
+    start = time.perf_counter()
+    try:
+        quantize_dynamic(
+            model_path,
+            tmp_path,
+            op_types_to_quantize=settings.INT8_OP_TYPES or None,
+            weight_type=QuantType.QInt8,
+        )
+        os.replace(tmp_path, target)
+    except Exception as e:
+        logger.warning(f"Could not quantize {model_path}, using FP32: {e}")
+        discard_optimized(tmp_path)
+        return model_path
+    logger.info(f"Quantized {os.path.basename(model_path)} to INT8 in {time.perf_counter() - start:.1f}s")
+    return target
+
+
+def tune_session_options(options: Optional[ort.SessionOptions]) -> ort.SessionOptions:
+    """Apply the configured tuning, keeping thread counts the caller already set."""
+    options = options or ort.SessionOptions()
+    options.graph_optimization_level = _OPTIMIZATION_LEVELS.get(
+        settings.ORT_GRAPH_OPTIMIZATION, ort.GraphOptimizationLevel.ORT_ENABLE_ALL
+    )
+    options.execution_mode = _EXECUTION_MODES.get(settings.ORT_EXECUTION_MODE, ort.ExecutionMode.ORT_SEQUENTIAL)
+    options.enable_cpu_mem_arena = settings.ORT_ENABLE_CPU_MEM_ARENA
+    options.enable_mem_pattern = settings.ORT_ENABLE_MEM_PATTERN
+    # The options object may be shared by several sessions; set per session below
+    options.optimized_model_filepath = ""
+    return options
+
+
+def _cached_model_path(model_path: str) -> str:
+    stat = os.stat(model_path)
+    key = "|".join([
+        os.path.abspath(model_path),
+        str(stat.st_size),
+        str(stat.st_mtime_ns),
+        ort.__version__,
+        settings.ORT_GRAPH_OPTIMIZATION,
+        platform.machine(),
+    ])
+    digest = hashlib.sha256(key.encode()).hexdigest()[:16]
+    stem = os.path.splitext(os.path.basename(model_path))[0]
+    return os.path.join(settings.ORT_OPTIMIZED_MODEL_DIR, f"{stem}-{digest}.onnx")
+
+
+def prepare_session(
+    path_or_bytes, options: ort.SessionOptions, providers: List[str]
+) -> Tuple[object, Optional[Tuple[str, str]]]:
+    """Pick the model to load and set up saving of its optimized graph.
+
+    Returns the path (or bytes) to load and, when an optimized graph is being
+    written, ``(tmp_path, cached_path)`` to publish once the session exists.
+    """
+    if getattr(_loading, "int8", False) and isinstance(path_or_bytes, (str, os.PathLike)):
+        path_or_bytes = quantized_model_path(os.fspath(path_or_bytes))
+
+    if (
+        not settings.ORT_OPTIMIZED_MODEL_DIR
+        or not isinstance(path_or_bytes, (str, os.PathLike))
+        or providers != ["CPUExecutionProvider"]
+        or options.graph_optimization_level == ort.GraphOptimizationLevel.ORT_DISABLE_ALL
+    ):
+        return path_or_bytes, None
+
+    model_path = os.fspath(path_or_bytes)
+    try:
+        cached = _cached_model_path(model_path)
+    except OSError:
+        return path_or_bytes, None
+
+    if os.path.exists(cached):
+        metrics.inc("ort_optimized_model", result="hit")
+        logger.debug(f"Loading optimized graph {cached}")
+        options.graph_optimization_level = ort.GraphOptimizationLevel.ORT_DISABLE_ALL
+        return cached, None
+
+    metrics.inc("ort_optimized_model", result="miss")
+    os.makedirs(settings.ORT_OPTIMIZED_MODEL_DIR, exist_ok=True)
+    # Unique per process so concurrent workers never read a half-written file
+    tmp_path = f"{cached}.{os.getpid()}.tmp"
+    options.optimized_model_filepath = tmp_path
+    return path_or_bytes, (tmp_path, cached)
+
+
+def publish_optimized(pending: Optional[Tuple[str, str]]):
+    """Move a freshly written optimized graph into the cache."""
+    if pending is None:
+        return
+    tmp_path, cached = pending
+    try:
+        os.replace(tmp_path, cached)
+        logger.info(f"Saved optimized ONNX graph to {cached}")
+    except OSError as e:
+        logger.warning(f"Could not save optimized ONNX graph: {e}")
+
+
+def discard_optimized(path: str):
+    """Remove a generated model file if it exists."""
+    try:
+        os.remove(path)
+    except OSError:
+        pass
@@ -0,0 +1,64 @@
+"""
+Sentence-level cache of trimmed int16 PCM.
+
+Audio lives in one preallocated block array instead of one ndarray per
+entry; each entry only records which blocks it occupies. Whole entries are
+evicted least-recently-used first when the block pool runs out.
+"""
+import hashlib
+from collections import OrderedDict
+from typing import Hashable, Optional, Tuple
+
+import numpy as np
+
+from app.core.metrics import metrics
+
+
+class PCMCache:
+    """Memory-bounded LRU of int16 PCM backed by a fixed block pool."""
+
+    def __init__(self, capacity_mb: float, block_samples: int = 4096):
+        self.block_samples = max(256, block_samples)
+        block_bytes = self.block_samples * 2
+        self.num_blocks = int(capacity_mb * 1024 * 1024) // block_bytes
+        self._store = np.zeros((self.num_blocks, self.block_samples), dtype=np.int16)
+        self._free = list(range(self.num_blocks - 1, -1, -1))
+        # digest -> (block indices, sample count)
+        self._entries: "OrderedDict[bytes, Tuple[np.ndarray, int]]" = OrderedDict()
+
+    @staticmethod
+    def _digest(key: Hashable) -> bytes:
+        return hashlib.blake2b(repr(key).encode("utf-8"), digest_size=16).digest()
+
+    def get(self, key: Hashable) -> Optional[np.ndarray]:
+        digest = self._digest(key)
+        entry = self._entries.get(digest)
+        if entry is None:
+            metrics.inc("pcm_cache_misses")
+            return None
+        self._entries.move_to_end(digest)
+        blocks, length = entry
+        metrics.inc("pcm_cache_hits")
+        return self._store[blocks].reshape(-1)[:length]
+
+    def put(self, key: Hashable, pcm: np.ndarray):
+        digest = self._digest(key)
+        if digest in self._entries or pcm.dtype != np.int16:
+            return
+        needed = -(-len(pcm) // self.block_samples)
+        if needed == 0 or needed > self.num_blocks:
+            return
+        while len(self._free) < needed:
+            _, (blocks, _) = self._entries.popitem(last=False)
+            self._free.extend(blocks.tolist())
+            metrics.inc("pcm_cache_evictions")
+
+        blocks = np.array([self._free.pop() for _ in range(needed)], dtype=np.int32)
+        padded = np.zeros(needed * self.block_samples, dtype=np.int16)
+        padded[:len(pcm)] = pcm
+        self._store[blocks] = padded.reshape(needed, self.block_samples)
+        self._entries[digest] = (blocks, len(pcm))
+        metrics.set_gauge("pcm_cache_entries", len(self._entries))
+        metrics.set_gauge(
+            "pcm_cache_bytes", (self.num_blocks - len(self._free)) * self.block_samples * 2
+        )
@@ -0,0 +1,117 @@
+import os
+import threading
+from collections import OrderedDict
+from dataclasses import dataclass, field
+from typing import Any, Callable, Dict, Optional
+
+from app.core.logging import logger
+from app.core.metrics import metrics
+
+
+def _rss_mb() -> Optional[float]:
+    """Current resident set size in MB (Linux only)."""
+    try:
+        with open("/proc/self/statm") as f:
+            resident_pages = int(f.read().split()[1])
+        return resident_pages * os.sysconf("SC_PAGE_SIZE") / (1024 * 1024)
+    except (OSError, ValueError, IndexError):
+        return None
+
+
+@dataclass
+class _Entry:
+    model: Any
+    size_mb: float
+    styles: Dict[str, Any] = field(default_factory=dict)
+
+
+class ModelRegistry:
+    """
+    Keeps several model versions resident at once.
+
+    Each version loads under its own lock, so a v2 load never blocks v1
+    traffic. When the summed model footprint exceeds ``memory_budget_mb``
+    the least recently used versions are evicted (the newest load always
+    stays). Voice styles are cached per model.
+    """
+
+    def __init__(
+        self,
+        loader: Callable[[str], Any],
+        memory_budget_mb: float = 0,
+        size_estimate_mb: float = 400,
+    ):
+        self.loader = loader
+        self.memory_budget_mb = memory_budget_mb
+        self.size_estimate_mb = size_estimate_mb
+        self._entries: "OrderedDict[str, _Entry]" = OrderedDict()
+        self._lock = threading.Lock()
+        self._version_locks: Dict[str, threading.Lock] = {}
+
+    def _version_lock(self, version: str) -> threading.Lock:
+        with self._lock:
+            return self._version_locks.setdefault(version, threading.Lock())
+
+    def peek(self, version: str) -> Optional[Any]:
+        """Return the model if it is loaded, without loading or touching LRU order."""
+        entry = self._entries.get(version)
+        return entry.model if entry else None
+
+    def loaded_versions(self) -> list:
+        return list(self._entries.keys())
+
+    def get(self, version: str) -> Any:
+        """Return the model for version, loading it if needed."""
+        with self._lock:
+            entry = self._entries.get(version)
+            if entry:
+                self._entries.move_to_end(version)
+                return entry.model
+
+        with self._version_lock(version):
+            # Another thread may have finished the load while we waited
+            with self._lock:
+                entry = self._entries.get(version)
+                if entry:
+                    self._entries.move_to_end(version)
+                    return entry.model
+
+            before = _rss_mb()
+            model = self.loader(version)
+            after = _rss_mb()
+            size_mb = self.size_estimate_mb
+            if before is not None and after is not None and after > before:
+                size_mb = after - before
+
+            with self._lock:
+                self._entries[version] = _Entry(model=model, size_mb=size_mb)
+                metrics.inc("model_loads", version=version)
+                self._evict()
+                metrics.set_gauge("models_loaded", len(self._entries))
+                metrics.set_gauge("models_memory_mb", sum(e.size_mb for e in self._entries.values()))
+            logger.info(f"Model {version} resident (~{size_mb:.0f}MB)")
+            return model
+
+    def _evict(self):
+        """Drop least recently used models until under budget. Caller holds _lock."""
+        if self.memory_budget_mb <= 0:
+            return
+        while len(self._entries) > 1:
+            total = sum(e.size_mb for e in self._entries.values())
+            if total <= self.memory_budget_mb:
+                return
+            version, _ = self._entries.popitem(last=False)
+            metrics.inc("model_evictions", version=version)
+            logger.info(f"Evicted model {version} (budget {self.memory_budget_mb}MB)")
+
+    def get_style(self, version: str, style_name: str) -> Any:
+        """Return a cached voice style for the given model version."""
+        model = self.get(version)
+        entry = self._entries.get(version)
+        if entry is None or entry.model is not model:
+            return model.get_voice_style(voice_name=style_name)
+        style = entry.styles.get(style_name)
+        if style is None:
+            style = model.get_voice_style(voice_name=style_name)
+            entry.styles[style_name] = style
+        return style
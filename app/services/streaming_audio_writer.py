@@ -1,3 +1,4 @@
+import threading
 from io import BytesIO
 from typing import Optional
 import av
@@ -42,6 +43,8 @@ class StreamingAudioWriter:
         self.sample_rate = sample_rate
         self.channels = channels
         self.pts = 0
+        # Encodes run on worker threads; a cancelled caller may leave one running
+        self._lock = threading.Lock()
 
         if self.format == "pcm":
             # PCM is raw audio, no container needed
@@ -73,9 +76,10 @@ class StreamingAudioWriter:
             raise ValueError(f"Unsupported format: {self.format}")
 
     def close(self):
-        """Close and cleanup resources."""
-        if hasattr(self, "output_buffer") and self.output_buffer:
-            self.output_buffer.close()
+        """Close and cleanup resources, after any write in progress."""
+        with self._lock:
+            if hasattr(self, "output_buffer") and self.output_buffer:
+                self.output_buffer.close()
 
     def write_chunk(
         self, audio_data: Optional[np.ndarray] = None, finalize: bool = False
@@ -86,6 +90,10 @@ class StreamingAudioWriter:
             audio_data: Audio data to write, or None if finalizing
             finalize: Whether this is the final write to close the stream
         """
+        with self._lock:
+            return self._write_chunk(audio_data, finalize)
+
+    def _write_chunk(self, audio_data: Optional[np.ndarray], finalize: bool) -> bytes:
         if finalize:
             if self.format == "pcm":
                 return b""
@@ -1,34 +1,112 @@
 import logging
 import asyncio
+import copy
+import time
+from collections import deque
+from dataclasses import dataclass
+from typing import Any, AsyncIterable, Optional, Union
 import numpy as np
 import onnxruntime as ort
 from supertonic import TTS
 from app.core.config import settings
 from app.inference.base import AudioChunk
 from app.services.audio import AudioService, AudioNormalizer
+from app.services.batching import BatchScheduler
+from app.services.executors import inference_executor, encode_executor, shutdown_executors
+from app.services.pcm_cache import PCMCache
+from app.services.fair_queue import FairScheduler
+from app.services.admission import admission
+from app.services.deadlines import DeadlineExceeded, check_deadline, missed, time_left
+from app.services.worker_pool import InferenceWorkerPool
+from app.services.registry import ModelRegistry
+from app.services.ort_session import (
+    INT8_SUFFIX,
+    discard_optimized,
+    int8_sessions,
+    prepare_session,
+    publish_optimized,
+    tune_session_options,
+)
 from app.services.streaming_audio_writer import StreamingAudioWriter
-from app.utils.text import smart_split
+from app.utils.text import smart_split, smart_split_stream
 from app.core.voices import OPENAI_TO_SUPERTONIC
+from app.core.metrics import metrics
 from app.core.logging import logger
 
 # Force disable xet protocol for HuggingFace downloads
 import os
 os.environ['HF_HUB_DISABLE_XET'] = '1'
 
+_WARMUP_SENTENCE = "The quick brown fox jumps over the lazy dog, and then it rests in the sun. "
+
+
+def _warmup_text(length: int) -> str:
+    """Build warm-up text of roughly the given length, ending on a word boundary."""
+    text = _WARMUP_SENTENCE * (length // len(_WARMUP_SENTENCE) + 1)
+    return text[:length].rsplit(" ", 1)[0].rstrip(",") + "."
+
+
+def _has_content(chunk) -> bool:
+    """A chunk is worth yielding if it carries encoded bytes or audio.
+
+    Encoders like mp3 may buffer a short chunk's bytes into a later one; the
+    chunk is still yielded so its text and timing reach the consumer.
+    """
+    return chunk is not None and (bool(chunk.output) or (chunk.audio is not None and len(chunk.audio) > 0))
+
+
+@dataclass
+class StreamContext:
+    """Per-request state shared by every chunk of one stream."""
+    model_version: str
+    model: Any
+    voice: str
+    style: Any
+    speed: float
+    normalizer: AudioNormalizer
+    tenant: str = "default"  # Fair-queueing key: the API key id (names need not be unique)
+    weight: float = 1.0
+    deadline: Optional[float] = None
+    steps: int = settings.DENOISING_STEPS
+    failed_chunks: int = 0  # Chunks dropped because synthesis failed
+
 
 class TTSService:
     """Singleton TTS service for audio generation."""
-    
-    _chunk_semaphore = asyncio.Semaphore(settings.MAX_WORKERS)
+
     _initialized = False
 
     def __init__(self):
-        self.model = None
-        self.model_version = "v1"  # Default to v1, can be set to "v2"
+        self.registry = ModelRegistry(
+            self._load_model,
+            memory_budget_mb=settings.MODEL_MEMORY_BUDGET_MB,
+            size_estimate_mb=settings.MODEL_SIZE_ESTIMATE_MB,
+        )
+        self.warmup = {"state": "disabled", "completed": 0, "total": 0, "error": None}
+        self._warmup_task = None
+        self._batcher = BatchScheduler(
+            self._run_batch,
+            max_batch_size=settings.BATCH_MAX_SIZE,
+            max_wait_ms=settings.BATCH_MAX_WAIT_MS,
+            bucket_edges=settings.BATCH_BUCKET_EDGES,
+            aging_ms=settings.BATCH_AGING_MS,
+        )
+        # Replaces a flat semaphore: chunk slots are shared fairly across API keys
+        self._scheduler = FairScheduler(settings.MAX_WORKERS * max(1, settings.BATCH_MAX_SIZE))
+        self._pcm_cache = None
+        if settings.PCM_CACHE_MB > 0:
+            self._pcm_cache = PCMCache(settings.PCM_CACHE_MB, settings.PCM_CACHE_BLOCK_SAMPLES)
+        self._worker_pool = None
+        if settings.INFERENCE_BACKEND == "process":
+            self._worker_pool = InferenceWorkerPool(
+                num_workers=settings.INFERENCE_PROCESSES,
+                threads_per_worker=settings.PROCESS_THREADS,
+                pin_cpus=settings.PIN_WORKER_CPUS,
+            )
         self._apply_patches()
         
     def _apply_patches(self):
-        """Patch ONNX Runtime to use configured providers."""
+        """Patch ONNX Runtime to use configured providers and tuned session options."""
         try:
             _original_session_init = ort.InferenceSession.__init__
             force_provider = settings.FORCE_PROVIDERS
@@ -38,7 +116,25 @@ class TTSService:
                 selected_providers = self._select_providers(force_provider, available)
                 kwargs["providers"] = selected_providers
                 logger.debug(f"Patched ORT Session providers: {selected_providers}")
-                _original_session_init(session_self, path_or_bytes, *args, **kwargs)
+
+                if args:
+                    sess_options, args = args[0], args[1:]
+                else:
+                    sess_options = kwargs.pop("sess_options", None)
+                sess_options = tune_session_options(sess_options)
+                model, pending = prepare_session(path_or_bytes, sess_options, selected_providers)
+                try:
+                    _original_session_init(session_self, model, sess_options, *args, **kwargs)
+                except Exception:
+                    if model is path_or_bytes:
+                        raise
+                    # Unreadable cached graph: drop it and optimize the original again
+                    logger.warning(f"Cached optimized graph {model} failed to load, rebuilding")
+                    discard_optimized(model)
+                    sess_options = tune_session_options(sess_options)
+                    model, pending = prepare_session(path_or_bytes, sess_options, selected_providers)
+                    _original_session_init(session_self, model, sess_options, *args, **kwargs)
+                publish_optimized(pending)
 
             ort.InferenceSession.__init__ = _patched_session_init
             logger.info(f"Monkey patched ONNX Runtime. Strategy: {force_provider}")
@@ -69,152 +165,541 @@ class TTSService:
         return ["CPUExecutionProvider"]
 
     def initialize(self):
-        """Initialize the TTS model - lazy loading."""
-        logger.info("TTS Service initialized (model will load on first request)")
+        """Initialize the TTS service and start background preload/warm-up if configured."""
+        if settings.PRELOAD_MODEL_VERSIONS:
+            self.warmup["state"] = "pending"
+            self._warmup_task = asyncio.ensure_future(self.warm_up())
+            logger.info(f"TTS Service initialized (preloading {settings.PRELOAD_MODEL_VERSIONS})")
+        else:
+            logger.info("TTS Service initialized (model will load on first request)")
         self._initialized = True
 
-    def _ensure_model_loaded(self, model_version: str = None):
-        """Ensure model is loaded, lazy load if needed."""
-        # Check if we need to switch model version
-        if model_version and model_version != self.model_version:
-            logger.info(f"Switching model version from {self.model_version} to {model_version}")
-            self.model_version = model_version
-            self.model = None  # Force reload with new version
-        
-        if self.model is None:
-            logger.info(f"Loading Supertonic TTS Model ({self.model_version})...")
-            kwargs = {}
-            if settings.MODEL_THREADS > 0:
-                kwargs['intra_op_num_threads'] = settings.MODEL_THREADS
-                kwargs['inter_op_num_threads'] = settings.MODEL_INTER_THREADS
-            
-            # Supertonic v2 uses different model ID
-            if self.model_version == "v2":
-                kwargs['model_id'] = "supertonic-tts-v2"
+    @property
+    def is_ready(self) -> bool:
+        """True once warm-up has finished, or immediately when preloading is disabled.
+
+        A failed warm-up also counts: requests then load models on first use,
+        as they do without preloading.
+        """
+        return self.warmup["state"] in ("ready", "disabled", "failed")
+
+    @property
+    def is_warming_up(self) -> bool:
+        return self.warmup["state"] in ("pending", "running")
+
+    async def warm_up(self):
+        """Load configured model versions and run warm-up syntheses per voice and chunk length.
+
+        The first runs trigger ONNX Runtime's allocations and kernel selection
+        so the first real request does not pay for them. With the process
+        backend every worker runs the whole plan, since each has its own
+        sessions.
+        """
+        self.warmup["state"] = "running"
+        loop = asyncio.get_running_loop()
+        start = loop.time()
+        try:
+            plan = []
+            for version in settings.PRELOAD_MODEL_VERSIONS:
+                model = await loop.run_in_executor(None, self._ensure_model_loaded, version)
+                voices = settings.WARMUP_VOICES or getattr(model, "voice_style_names", []) or ["alloy"]
+                for voice in voices:
+                    for length in settings.WARMUP_TEXT_LENGTHS:
+                        plan.append((version, model, voice, _warmup_text(length)))
+            self.warmup["total"] = len(plan)
+
+            if self._worker_pool is not None:
+                for version in settings.PRELOAD_MODEL_VERSIONS:
+                    entries = [(voice, text) for v, _, voice, text in plan if v == version]
+                    await self._worker_pool.warm_up(version, entries, settings.DENOISING_STEPS)
+                    self.warmup["completed"] += len(entries)
             else:
-                kwargs['auto_download'] = True
-                
-            self.model = TTS(auto_download=True, **kwargs)
-            logger.info(f"Supertonic TTS Model ({self.model_version}) loaded successfully.")
+                for version, model, voice, text in plan:
+                    style = self.get_style(voice, version)
+                    await self._run_batch(
+                        (version, voice, 1.0, settings.DENOISING_STEPS), [text], (model, style)
+                    )
+                    self.warmup["completed"] += 1
 
-    def get_style(self, voice_name: str):
-        """Get voice style from voice name."""
-        self._ensure_model_loaded()
-        
-        available = getattr(self.model, "voice_style_names", [])
+            self.warmup["state"] = "ready"
+            elapsed = loop.time() - start
+            metrics.set_gauge("warmup_seconds", elapsed)
+            logger.info(f"Warm-up complete: {len(plan)} syntheses in {elapsed:.1f}s")
+        except Exception as e:
+            self.warmup["state"] = "failed"
+            self.warmup["error"] = str(e)
+            logger.error(f"Warm-up failed, models will load on first request: {e}")
+
+    def shutdown(self):
+        """Release inference worker processes and stage executors."""
+        if self._warmup_task is not None and not self._warmup_task.done():
+            self._warmup_task.cancel()
+        if self._worker_pool is not None:
+            self._worker_pool.shutdown()
+        shutdown_executors()
+
+    @property
+    def model(self):
+        """The default-version model if resident, otherwise any resident model."""
+        model = self.registry.peek(settings.DEFAULT_MODEL_VERSION)
+        if model is None:
+            for version in self.registry.loaded_versions():
+                return self.registry.peek(version)
+        return model
+
+    def _load_model(self, model_version: str):
+        """Load a Supertonic model version (registry loader)."""
+        logger.info(f"Loading Supertonic TTS Model ({model_version})...")
+        if self._worker_pool is not None:
+            # Sessions live in the worker processes; keep only what the parent uses
+            model = self._worker_pool.describe(model_version)
+            logger.info(f"Supertonic TTS Model ({model_version}) loaded in an inference worker.")
+            return model
+
+        kwargs = {}
+        if settings.MODEL_THREADS > 0:
+            kwargs['intra_op_num_threads'] = settings.MODEL_THREADS
+            kwargs['inter_op_num_threads'] = settings.MODEL_INTER_THREADS
+
+        # "v1-int8" is v1 with INT8-quantized sessions
+        base_version = model_version.removesuffix(INT8_SUFFIX)
+        int8 = settings.INT8_QUANTIZATION or base_version != model_version
+
+        # Supertonic v2 uses different model ID
+        if base_version == "v2":
+            kwargs['model_id'] = "supertonic-tts-v2"
+
+        with int8_sessions(int8):
+            model = TTS(auto_download=True, **kwargs)
+        logger.info(f"Supertonic TTS Model ({model_version}) loaded successfully.")
+        return model
+
+    def _ensure_model_loaded(self, model_version: str = None):
+        """Ensure a model version is resident, lazy load if needed, and return it."""
+        return self.registry.get(model_version or settings.DEFAULT_MODEL_VERSION)
+
+    async def get_model(self, model_version: str = None):
+        """A resident model version, loading it off the event loop if needed."""
+        model_version = model_version or settings.DEFAULT_MODEL_VERSION
+        model = self.registry.peek(model_version)
+        if model is None:
+            # Load off the event loop; other versions keep serving meanwhile
+            loop = asyncio.get_running_loop()
+            model = await loop.run_in_executor(None, self._ensure_model_loaded, model_version)
+        return model
+
+    def get_style(self, voice_name: str, model_version: str = None):
+        """Get voice style from voice name for the given model version."""
+        model_version = model_version or settings.DEFAULT_MODEL_VERSION
+        model = self._ensure_model_loaded(model_version)
+
+        available = getattr(model, "voice_style_names", [])
         target = (
             voice_name
             if voice_name in available
             else OPENAI_TO_SUPERTONIC.get(voice_name, available[0] if available else "F1")
         )
-        return self.model.get_voice_style(voice_name=target)
+        return self.registry.get_style(model_version, target)
+
+    @staticmethod
+    def _tile_style(style, batch_size: int):
+        """Repeat a single-speaker style along the batch axis."""
+        tiled = copy.copy(style)
+        for name, value in vars(style).items():
+            if isinstance(value, np.ndarray) and value.ndim > 0 and value.shape[0] == 1:
+                setattr(tiled, name, np.repeat(value, batch_size, axis=0))
+        return tiled
+
+    @staticmethod
+    def _squeeze(wav):
+        """Handle 2D audio arrays."""
+        if wav.ndim == 2 and wav.shape[0] == 1:
+            wav = wav.squeeze()
+        return wav
+
+    @staticmethod
+    def _lang(model) -> dict:
+        """Language for multilingual model releases; English-only v1 takes none."""
+        return {"lang": "en"} if getattr(model, "is_multilingual", False) else {}
+
+    def _infer_batch(self, model, texts: list, style, speed: float, steps: int) -> list:
+        """Synthesize a batch of texts, returning one waveform (or None) per text.
+
+        Several texts run as one padded call to the core engine (``model.model``),
+        and each waveform is cut back to its own predicted duration. If that
+        call fails the texts are synthesized one by one.
+        """
+        if len(texts) > 1:
+            try:
+                wav, duration = model.model(
+                    texts, self._tile_style(style, len(texts)), steps, speed, **self._lang(model)
+                )
+                durations = np.ravel(duration)
+                # Padding actually computed: every item runs for the longest duration
+                metrics.observe(
+                    "batch_audio_padding_ratio",
+                    1 - float(durations.sum()) / (float(durations.max()) * len(texts)),
+                )
+                return [
+                    wav[i, :int(model.sample_rate * float(durations[i]))]
+                    for i in range(len(texts))
+                ]
+            except Exception as e:
+                logger.warning(f"Batched synthesis failed, running sequentially: {e}")
+
+        results = []
+        for text in texts:
+            try:
+                wav, _ = model.synthesize(
+                    text, style, total_steps=steps, speed=speed, **self._lang(model)
+                )
+                results.append(self._squeeze(wav))
+            except Exception as e:
+                logger.error(f"Failed to synthesize chunk: {e}")
+                results.append(None)
+        return results
+
+    def _timed_infer_batch(self, model, texts: list, style, speed: float, steps: int):
+        """_infer_batch plus the seconds it took, excluding executor queueing."""
+        start = time.perf_counter()
+        wavs = self._infer_batch(model, texts, style, speed, steps)
+        return wavs, time.perf_counter() - start
+
+    async def _run_batch(self, key, texts: list, context) -> list:
+        """Batch scheduler runner: one executor job per batch."""
+        model, style = context
+        model_version, voice, speed, steps = key
+        logger.debug(f"Synthesizing batch: size={len(texts)}, speed={speed}, steps={steps}")
+        if self._worker_pool is not None:
+            wavs, elapsed = await self._worker_pool.synthesize(texts, voice, speed, model_version, steps)
+        else:
+            wavs, elapsed = await inference_executor.run(
+                self._timed_infer_batch, model, texts, style, speed, steps
+            )
+
+        if admission is not None:
+            samples = sum(len(wav) for wav in wavs if wav is not None)
+            chars = sum(len(text) for text, wav in zip(texts, wavs) if wav is not None)
+            admission.observe(chars, samples / model.sample_rate, elapsed, speed, steps)
+        return wavs
+
+    async def stream_context(
+        self,
+        voice: str,
+        speed: float = 1.0,
+        model_version: str = None,
+        tenant: str = "default",
+        weight: float = 1.0,
+        deadline: Optional[float] = None,
+        normalizer: Optional[AudioNormalizer] = None,
+        steps: Optional[int] = None,
+    ) -> StreamContext:
+        """Resolve the model, style and normalizer shared by every chunk of one stream."""
+        model_version = model_version or settings.DEFAULT_MODEL_VERSION
+        model = await self.get_model(model_version)
+        style = self.get_style(voice, model_version)
+        normalizer = normalizer or AudioNormalizer()
+        normalizer.sample_rate = model.sample_rate
+        return StreamContext(
+            model_version=model_version,
+            model=model,
+            voice=voice,
+            style=style,
+            speed=speed,
+            normalizer=normalizer,
+            tenant=tenant,
+            weight=weight,
+            deadline=deadline,
+            steps=steps or settings.DENOISING_STEPS,
+        )
 
-    async def _process_chunk(
+    async def synthesize_chunk(self, chunk_text: str, ctx: StreamContext):
+        """Trimmed int16 PCM for one already-split chunk, or None if synthesis failed."""
+        pcm, _, _ = await self._synthesize_chunk(chunk_text, ctx)
+        return pcm
+
+    @staticmethod
+    def _trim_pcm(wav, chunk_text: str, speed: float, normalizer: AudioNormalizer):
+        """Normalize a waveform to int16 and trim its silent edges."""
+        audio_chunk = AudioChunk(audio=wav, sample_rate=normalizer.sample_rate, text=chunk_text)
+        return AudioService.trim_audio(audio_chunk, chunk_text, speed, False, normalizer).audio
+
+    async def _synthesize_chunk(self, chunk_text: str, ctx: StreamContext):
+        """Trimmed int16 PCM for a text chunk, from the sentence cache or the model.
+
+        Returns ``(pcm, inference_ms, trim_ms)``; inference time runs from
+        dispatch to the batcher until the waveform is back.
+        """
+        cache_key = (chunk_text, ctx.voice, ctx.speed, ctx.model_version, ctx.steps)
+        try:
+            if self._pcm_cache is not None:
+                pcm = self._pcm_cache.get(cache_key)
+                if pcm is not None:
+                    return pcm, 0.0, 0.0
+
+            # Expired chunks are dropped before they reach inference
+            check_deadline(ctx.deadline, "queue")
+            try:
+                await self._scheduler.acquire(
+                    ctx.tenant, ctx.weight, cost=len(chunk_text), timeout=time_left(ctx.deadline)
+                )
+            except asyncio.TimeoutError:
+                raise missed("queue")
+            start = time.perf_counter()
+            try:
+                wav = await self._batcher.submit(
+                    (ctx.model_version, ctx.voice, ctx.speed, ctx.steps), chunk_text,
+                    (ctx.model, ctx.style), deadline=ctx.deadline,
+                )
+            finally:
+                self._scheduler.release()
+            inference_ms = (time.perf_counter() - start) * 1000
+            if wav is None:
+                ctx.failed_chunks += 1
+                return None, inference_ms, 0.0
+            logger.debug(f"Synthesized: shape={wav.shape}, dtype={wav.dtype}")
+
+            start = time.perf_counter()
+            pcm = await encode_executor.run(
+                self._trim_pcm, wav, chunk_text, ctx.speed, ctx.normalizer
+            )
+            trim_ms = (time.perf_counter() - start) * 1000
+            if self._pcm_cache is not None:
+                self._pcm_cache.put(cache_key, pcm)
+            return pcm, inference_ms, trim_ms
+        except (asyncio.CancelledError, DeadlineExceeded):
+            raise
+        except Exception as e:
+            logger.error(f"Failed to synthesize chunk: {e}")
+            import traceback
+            logger.error(traceback.format_exc())
+            ctx.failed_chunks += 1
+            return None, 0.0, 0.0
+
+    async def _encode_chunk(
         self,
         chunk_text: str,
-        style,
+        pcm,
         speed: float,
         writer: StreamingAudioWriter,
         output_format: str,
-        is_last: bool = False,
-        normalizer: AudioNormalizer = None,
+        normalizer: AudioNormalizer,
     ):
-        """Process a single text chunk and return audio data."""
-        async with self._chunk_semaphore:
-            try:
-                # Handle final chunk (flush)
-                if is_last:
-                    chunk_data = await AudioService.convert_audio(
-                        AudioChunk(np.array([], dtype=np.float32), sample_rate=self.model.sample_rate),
-                        output_format, writer, speed, "", normalizer=normalizer, is_last_chunk=True,
-                    )
-                    return chunk_data
-
-                if not chunk_text.strip():
-                    return None
-
-                loop = asyncio.get_event_loop()
-                logger.debug(f"Synthesizing: textlen={len(chunk_text)}, speed={speed}")
-                
-                # Run synthesis in thread pool
-                wav, _ = await loop.run_in_executor(
-                    None,
-                    lambda: self.model.synthesize(chunk_text, style, speed=speed)
-                )
+        """Encode already-trimmed PCM through the stream's writer."""
+        if pcm is None:
+            return None
+        try:
+            audio_chunk = AudioChunk(audio=pcm, sample_rate=normalizer.sample_rate, text=chunk_text)
+            return await AudioService.convert_audio(
+                audio_chunk, output_format, writer, speed, chunk_text,
+                is_last_chunk=False, trim_audio=False, normalizer=normalizer,
+            )
+        except Exception as e:
+            logger.error(f"Failed to encode chunk: {e}")
+            return None
 
-                logger.debug(f"Synthesized: shape={wav.shape}, dtype={wav.dtype}")
+    async def _encode_pause(
+        self,
+        pause_duration_s: float,
+        speed: float,
+        writer: StreamingAudioWriter,
+        output_format: str,
+        normalizer: AudioNormalizer,
+    ):
+        """Encode a block of silence for a pause tag."""
+        silence_samples = int(pause_duration_s * normalizer.sample_rate)
+        silence_audio = np.zeros(silence_samples, dtype=np.int16)
+        pause_chunk = AudioChunk(audio=silence_audio, sample_rate=normalizer.sample_rate)
 
-                # Handle 2D audio arrays
-                if wav.ndim == 2 and wav.shape[0] == 1:
-                    wav = wav.squeeze()
+        return await AudioService.convert_audio(
+            pause_chunk, output_format, writer, speed=speed,
+            is_last_chunk=False, trim_audio=False, normalizer=normalizer
+        )
 
-                audio_chunk = AudioChunk(audio=wav, sample_rate=self.model.sample_rate, text=chunk_text)
-                
-                return await AudioService.convert_audio(
-                    audio_chunk, output_format, writer, speed, chunk_text,
-                    is_last_chunk=is_last, normalizer=normalizer,
-                )
-            except Exception as e:
-                logger.error(f"Failed to process chunk: {e}")
-                import traceback
-                logger.error(traceback.format_exc())
-                return None
+    async def _finalize_stream(
+        self,
+        speed: float,
+        writer: StreamingAudioWriter,
+        output_format: str,
+        normalizer: AudioNormalizer,
+    ):
+        """Flush the encoder and return any trailing bytes."""
+        try:
+            return await AudioService.convert_audio(
+                AudioChunk(np.array([], dtype=np.float32), sample_rate=normalizer.sample_rate),
+                output_format, writer, speed, "", normalizer=normalizer, is_last_chunk=True,
+            )
+        except Exception as e:
+            logger.error(f"Failed to finalize stream: {e}")
+            return None
 
     async def generate_audio_stream(
         self,
-        text: str,
+        text: Union[str, AsyncIterable[str]],
         voice: str,
         writer: StreamingAudioWriter,
         speed: float = 1.0,
         output_format: str = "wav",
         model_version: str = None,
+        tenant: str = "default",
+        weight: float = 1.0,
+        deadline: Optional[float] = None,
+        chunking: str = "fixed",
+        normalizer: Optional[AudioNormalizer] = None,
+        finalize: bool = True,
+        steps: Optional[int] = None,
+        ctx: Optional[StreamContext] = None,
     ):
-        """Generate audio stream from text."""
-        self._ensure_model_loaded(model_version)
+        """Generate audio stream from text.
 
-        style = self.get_style(voice)
-        stream_normalizer = AudioNormalizer()
-        stream_normalizer.sample_rate = self.model.sample_rate
+        Up to ``PIPELINE_DEPTH`` chunks are synthesized ahead of the one being
+        encoded, so inference of chunk N+1 overlaps encoding of chunk N. The
+        writer is stateful, so encoding always happens in input order. Chunk
+        inference slots are shared fairly between tenants by ``weight``.
+
+        If ``deadline`` (a ``time.monotonic()`` timestamp) passes, remaining
+        chunks are dropped, the audio produced so far is finalized so the
+        stream stays playable, and DeadlineExceeded is raised.
+
+        ``chunking="adaptive"`` keeps the first chunk short for a fast
+        time-to-first-audio and grows later chunks with the measured RTF.
+
+        ``text`` may also be an async iterable of text fragments, which is
+        split incrementally (see ``generate_audio_stream_incremental``).
+
+        A session that spans several calls (e.g. a WebSocket) passes its own
+        ``normalizer`` and ``finalize=False``, and finalizes the writer once
+        when it ends.
+
+        ``steps`` is the denoising step count (default ``DENOISING_STEPS``);
+        fewer steps trade quality for speed.
+
+        A caller that needs to inspect the stream afterwards (e.g.
+        ``ctx.failed_chunks``) builds ``ctx`` with ``stream_context`` and
+        passes it in; it then replaces the voice, speed, model, tenant,
+        deadline, normalizer and steps arguments.
+        """
+        if ctx is None:
+            ctx = await self.stream_context(
+                voice, speed, model_version, tenant, weight, deadline, normalizer, steps
+            )
+        speed = ctx.speed
+        deadline = ctx.deadline
+        stream_normalizer = ctx.normalizer
+        depth = max(1, settings.PIPELINE_DEPTH)
+        # Entries are (chunk_text, pause_duration_s, inference task or None)
+        pending = deque()
         chunk_index = 0
+        emitted_chars = 0
+        split_chars = 0
+        first_chunk_length = settings.FIRST_CHUNK_LENGTH if chunking == "adaptive" else None
+        rtf = admission.rtf_for(ctx.steps) if admission is not None else None
 
-        async for chunk_text, tokens, pause_duration_s in smart_split(text):
-            # Handle pause tags
-            if pause_duration_s and pause_duration_s > 0:
-                silence_samples = int(pause_duration_s * self.model.sample_rate)
-                silence_audio = np.zeros(silence_samples, dtype=np.int16)
-                pause_chunk = AudioChunk(audio=silence_audio, sample_rate=self.model.sample_rate)
-                
-                formatted_pause = await AudioService.convert_audio(
-                    pause_chunk, output_format, writer, speed=speed, 
-                    is_last_chunk=False, trim_audio=False, normalizer=stream_normalizer
+        async def _emit(entry):
+            chunk_text, pause_duration_s, task = entry
+            if task is None:
+                return await self._encode_pause(
+                    pause_duration_s, speed, writer, output_format, stream_normalizer
                 )
-                if formatted_pause.output:
-                    yield formatted_pause
+            pcm, inference_ms, trim_ms = await task
+            check_deadline(deadline, "encode")
+            start = time.perf_counter()
+            processed = await self._encode_chunk(
+                chunk_text, pcm, speed, writer, output_format, stream_normalizer
+            )
+            if processed is not None:
+                processed.inference_ms = inference_ms
+                processed.encode_ms = trim_ms + (time.perf_counter() - start) * 1000
+            return processed
+
+        try:
+            splitter = smart_split if isinstance(text, str) else smart_split_stream
+            async for chunk_text, _, pause_duration_s in splitter(
+                text, settings.MAX_CHUNK_LENGTH, first_chunk_length, rtf
+            ):
+                split_chars += len(chunk_text)
+                # Handle pause tags
+                if pause_duration_s and pause_duration_s > 0:
+                    pending.append((chunk_text, pause_duration_s, None))
+                elif chunk_text.strip():
+                    task = asyncio.ensure_future(self._synthesize_chunk(chunk_text, ctx))
+                    pending.append((chunk_text, None, task))
+                else:
+                    continue
                 chunk_index += 1
-            elif chunk_text.strip():
-                processed = await self._process_chunk(
-                    chunk_text, style, speed, writer, output_format,
-                    is_last=False, normalizer=stream_normalizer
-                )
-                if processed and processed.output:
+
+                # Emit when the pipeline is full, and also whatever is already
+                # finished, since incremental text may keep the splitter waiting
+                while pending and (
+                    len(pending) >= depth or pending[0][2] is None or pending[0][2].done()
+                ):
+                    entry = pending.popleft()
+                    processed = await _emit(entry)
+                    emitted_chars += len(entry[0])
+                    if _has_content(processed):
+                        yield processed
+
+            while pending:
+                entry = pending.popleft()
+                processed = await _emit(entry)
+                emitted_chars += len(entry[0])
+                if _has_content(processed):
                     yield processed
-                chunk_index += 1
+        except DeadlineExceeded:
+            # End what was already sent cleanly; drop the rest
+            for _, _, task in pending:
+                if task is not None:
+                    task.cancel()
+            if emitted_chars and finalize:
+                final = await self._finalize_stream(speed, writer, output_format, stream_normalizer)
+                if final and final.output:
+                    yield final
+            raise
+        except (asyncio.CancelledError, GeneratorExit):
+            # Consumer went away (e.g. client disconnect); record what was skipped
+            dropped = sum(1 for _, _, task in pending if task is not None and not task.done())
+            metrics.inc("synthesis_cancelled")
+            metrics.inc("synthesis_cancelled_chunks", dropped)
+            total_chars = len(text) if isinstance(text, str) else split_chars
+            metrics.inc("synthesis_cancelled_chars", max(0, total_chars - emitted_chars))
+            raise
+        finally:
+            # Stop look-ahead work; queued chunks leave the fair queue and batcher
+            for _, _, task in pending:
+                if task is None:
+                    continue
+                if task.done() and not task.cancelled():
+                    task.exception()  # Already failed (e.g. deadline); mark as retrieved
+                else:
+                    task.cancel()
 
         # Finalize stream
-        if chunk_index > 0:
-            final = await self._process_chunk(
-                "", style, speed, writer, output_format,
-                is_last=True, normalizer=stream_normalizer
-            )
+        if chunk_index > 0 and finalize:
+            final = await self._finalize_stream(speed, writer, output_format, stream_normalizer)
             if final and final.output:
                 yield final
 
-    async def generate_audio(self, text: str, voice: str, writer: StreamingAudioWriter, speed: float = 1.0, output_format: str = "wav", model_version: str = None):
+    def generate_audio_stream_incremental(
+        self,
+        fragments: AsyncIterable[str],
+        voice: str,
+        writer: StreamingAudioWriter,
+        chunking: str = "adaptive",
+        **kwargs,
+    ):
+        """Generate audio while the text is still arriving, e.g. from an LLM token stream.
+
+        Chunks are synthesized as soon as a sentence or clause boundary is
+        confirmed, so audio starts a few tokens into the reply.
+        """
+        return self.generate_audio_stream(fragments, voice, writer, chunking=chunking, **kwargs)
+
+    async def generate_audio(self, text: str, voice: str, writer: StreamingAudioWriter, speed: float = 1.0, output_format: str = "wav", model_version: str = None, tenant: str = "default", weight: float = 1.0, deadline: Optional[float] = None, chunking: str = "fixed", steps: Optional[int] = None, ctx: Optional[StreamContext] = None):
         """Generate complete audio from text."""
         audio_chunks = []
         all_output_bytes = bytearray()
         
-        async for chunk in self.generate_audio_stream(text, voice, writer, speed, output_format, model_version):
+        async for chunk in self.generate_audio_stream(text, voice, writer, speed, output_format, model_version, tenant, weight, deadline, chunking, steps=steps, ctx=ctx):
             if chunk.output:
                 all_output_bytes.extend(chunk.output)
             if chunk.audio is not None:
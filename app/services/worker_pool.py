@@ -0,0 +1,209 @@
+"""
+Optional multi-process inference backend.
+
+Each worker process owns its own Supertonic/ONNX session, pinned to a
+disjoint subset of CPU cores. Waveforms come back through shared memory
+blocks rather than being pickled through the result pipe. The parent never
+creates sessions: it keeps a ModelInfo (sample rate, voice names and
+styles) reported by a worker.
+"""
+import asyncio
+import multiprocessing as mp
+import os
+import sys
+import time
+from concurrent.futures import ProcessPoolExecutor
+from multiprocessing import shared_memory
+from typing import Dict, List, Optional, Tuple
+
+import numpy as np
+
+from app.core.logging import logger
+
+# (shared memory name, sample count, dtype) for each synthesized chunk
+ShmRef = Optional[Tuple[str, int, str]]
+
+# Seconds a warm-up task waits for the other workers to pick up theirs
+_WARMUP_BARRIER_TIMEOUT_S = 600
+
+_worker_index = None
+_warmup_barrier = None
+
+
+class ModelInfo:
+    """The parts of a model the parent process needs; inference stays in the workers."""
+
+    def __init__(self, sample_rate: int, voice_style_names: List[str], styles: Dict[str, object]):
+        self.sample_rate = sample_rate
+        self.voice_style_names = voice_style_names
+        self.styles = styles
+
+    def get_voice_style(self, voice_name: str):
+        try:
+            return self.styles[voice_name]
+        except KeyError:
+            raise FileNotFoundError(f"Voice style '{voice_name}' not found") from None
+
+
+def _init_worker(counter, barrier, num_workers: int, threads_per_worker: int, pin_cpus: bool):
+    """Process initializer: claim a worker slot, pin cores and size ONNX threads."""
+    global _worker_index, _warmup_barrier
+    _warmup_barrier = barrier
+    with counter.get_lock():
+        _worker_index = counter.value
+        counter.value += 1
+
+    from app.core.config import settings
+    settings.INFERENCE_BACKEND = "thread"
+    settings.MODEL_THREADS = threads_per_worker
+    settings.MODEL_INTER_THREADS = 1
+    # Spawn re-imports the parent's main module, which may already have built
+    # the service with the process backend; workers must infer in-process
+    service_module = sys.modules.get("app.services.tts")
+    if service_module is not None:
+        service_module.tts_service._worker_pool = None
+
+    if pin_cpus and hasattr(os, "sched_setaffinity"):
+        cpus = sorted(os.sched_getaffinity(0))
+        per_worker = max(1, len(cpus) // num_workers)
+        start = (_worker_index * per_worker) % len(cpus)
+        subset = cpus[start:start + per_worker] or cpus
+        try:
+            os.sched_setaffinity(0, subset)
+        except OSError as e:
+            logger.warning(f"Could not pin inference worker {_worker_index}: {e}")
+
+
+def _to_shared(wav: np.ndarray) -> ShmRef:
+    """Copy a waveform into a new shared memory block and return its reference."""
+    wav = np.ascontiguousarray(wav)
+    shm = shared_memory.SharedMemory(create=True, size=max(wav.nbytes, 1))
+    np.ndarray(wav.shape, dtype=wav.dtype, buffer=shm.buf)[:] = wav
+    ref = (shm.name, int(wav.shape[0]), wav.dtype.str)
+    shm.close()
+    return ref
+
+
+def _worker_synthesize(
+    texts: List[str], voice: str, speed: float, model_version: str, steps: int
+) -> Tuple[List[ShmRef], float]:
+    """Run one batch inside a worker process; also returns the inference seconds."""
+    from app.services.tts import tts_service
+
+    model = tts_service._ensure_model_loaded(model_version)
+    style = tts_service.get_style(voice, model_version)
+    start = time.perf_counter()
+    wavs = tts_service._infer_batch(model, texts, style, speed, steps)
+    elapsed = time.perf_counter() - start
+    return [None if wav is None else _to_shared(wav) for wav in wavs], elapsed
+
+
+def _worker_describe(model_version: str) -> ModelInfo:
+    """Load a model version in a worker and report its sample rate and voice styles."""
+    from app.services.tts import tts_service
+
+    model = tts_service._ensure_model_loaded(model_version)
+    names = list(getattr(model, "voice_style_names", []))
+    styles = {name: tts_service.registry.get_style(model_version, name) for name in names}
+    return ModelInfo(model.sample_rate, names, styles)
+
+
+def _worker_warm_up(model_version: str, plan: List[Tuple[str, str]], steps: int) -> int:
+    """Run warm-up syntheses in a worker; returns the worker's index."""
+    from app.services.tts import tts_service
+
+    model = tts_service._ensure_model_loaded(model_version)
+    # Hold this worker until every worker has taken a warm-up task, so each runs exactly one
+    _warmup_barrier.wait(timeout=_WARMUP_BARRIER_TIMEOUT_S)
+    for voice, text in plan:
+        style = tts_service.get_style(voice, model_version)
+        tts_service._infer_batch(model, [text], style, 1.0, steps)
+    return _worker_index
+
+
+def _from_shared(ref: ShmRef) -> Optional[np.ndarray]:
+    """Read a waveform back from shared memory and release the block."""
+    if ref is None:
+        return None
+    name, length, dtype = ref
+    shm = shared_memory.SharedMemory(name=name)
+    try:
+        return np.ndarray((length,), dtype=np.dtype(dtype), buffer=shm.buf).copy()
+    finally:
+        shm.close()
+        shm.unlink()
+
+
+def _release_refs(future):
+    if not future.cancelled() and future.exception() is None:
+        refs, _ = future.result()
+        for ref in refs:
+            _from_shared(ref)
+
+
+class InferenceWorkerPool:
+    """Process pool that runs synthesis batches off the main interpreter."""
+
+    def __init__(self, num_workers: int = 0, threads_per_worker: int = 2, pin_cpus: bool = True):
+        cpu_count = os.cpu_count() or 1
+        self.threads_per_worker = max(1, threads_per_worker)
+        self.num_workers = num_workers or max(1, cpu_count // self.threads_per_worker)
+        self.pin_cpus = pin_cpus
+        self._executor = None
+
+    def _ensure_started(self):
+        if self._executor is None:
+            ctx = mp.get_context("spawn")
+            counter = ctx.Value("i", 0)
+            barrier = ctx.Barrier(self.num_workers)
+            self._executor = ProcessPoolExecutor(
+                max_workers=self.num_workers,
+                mp_context=ctx,
+                initializer=_init_worker,
+                initargs=(counter, barrier, self.num_workers, self.threads_per_worker, self.pin_cpus),
+            )
+            logger.info(
+                f"Started {self.num_workers} inference worker processes "
+                f"({self.threads_per_worker} threads each)"
+            )
+
+    def describe(self, model_version: str) -> ModelInfo:
+        """Load a model version in a worker and return its ModelInfo (blocking)."""
+        self._ensure_started()
+        return self._executor.submit(_worker_describe, model_version).result()
+
+    async def warm_up(self, model_version: str, plan: List[Tuple[str, str]], steps: int):
+        """Run the (voice, text) warm-up plan once in every worker process."""
+        self._ensure_started()
+        loop = asyncio.get_running_loop()
+        workers = await asyncio.gather(*(
+            loop.run_in_executor(self._executor, _worker_warm_up, model_version, plan, steps)
+            for _ in range(self.num_workers)
+        ))
+        logger.info(f"Warmed {model_version} in inference workers {sorted(workers)}")
+
+    async def synthesize(
+        self, texts: List[str], voice: str, speed: float, model_version: str, steps: int
+    ) -> Tuple[list, float]:
+        """Synthesize a batch in a worker process.
+
+        Returns one waveform per text and the seconds spent in inference.
+        """
+        self._ensure_started()
+        loop = asyncio.get_event_loop()
+        future = loop.run_in_executor(
+            self._executor, _worker_synthesize, texts, voice, speed, model_version, steps
+        )
+        try:
+            refs, elapsed = await asyncio.shield(future)
+        except asyncio.CancelledError:
+            # Free the shared blocks once the orphaned batch finishes
+            future.add_done_callback(_release_refs)
+            raise
+        return [_from_shared(ref) for ref in refs], elapsed
+
+    def shutdown(self):
+        """Stop all worker processes."""
+        if self._executor is not None:
+            self._executor.shutdown(wait=False, cancel_futures=True)
+            self._executor = None
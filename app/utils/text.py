@@ -1,6 +1,6 @@
 import re
 from unicodedata import normalize
-from typing import AsyncGenerator, Tuple, List, Optional
+from typing import AsyncGenerator, AsyncIterable, Iterator, Tuple, List, Optional
 
 # Pre-compiled regex patterns for better performance
 _EMOJI_PATTERN = re.compile(
@@ -70,7 +70,7 @@ _PARAGRAPH_PATTERN = re.compile(r"\n\s*\n+")
 _ENDING_PUNCTUATION_PATTERN = re.compile(r"[.!?;:,'\"')\]}…。」』】〉》›»]$")
 
 
-def clean_text(text: str) -> str:
+def clean_text(text: str, ensure_punctuation: bool = True) -> str:
     """
     Minimal text preprocessing for TTS.
     Replaces common symbols, removes emojis, and ensures basic punctuation.
@@ -107,25 +107,160 @@ def clean_text(text: str) -> str:
     text = _MULTISPACE_PATTERN.sub(" ", text).strip()
 
     # 9. Ensure ending punctuation
-    if text and not _ENDING_PUNCTUATION_PATTERN.search(text):
+    if ensure_punctuation and text and not _ENDING_PUNCTUATION_PATTERN.search(text):
         text += "."
 
     return text
 
 
-async def smart_split(
-    text: str,
-    max_chunk_length: int = 300,
-) -> AsyncGenerator[Tuple[str, List[int], Optional[float]], None]:
+def clean_fragment(text: str) -> str:
     """
-    Split text into chunks by paragraphs and sentences.
-    Yields: (chunk_text, tokens, pause_duration_s)
-    
-    Note: tokens are always empty list (kept for API compatibility)
+    clean_text for one piece of a longer text that arrives incrementally.
+    Keeps a single space at either edge (so words of adjacent fragments stay
+    apart) and does not add ending punctuation.
+    """
+    lead = " " if text[:1].isspace() else ""
+    trail = " " if text[-1:].isspace() else ""
+    cleaned = clean_text(text, ensure_punctuation=False)
+    if not cleaned:
+        return lead or trail
+    return lead + cleaned + trail
+
+
+# Clause boundary pattern (after a comma, semicolon or colon)
+_CLAUSE_PATTERN = re.compile(r"(?<=[,;:])\s+")
+
+# Break before a coordinating/subordinating conjunction
+_CONJUNCTION_PATTERN = re.compile(
+    r"\s+(?=(?:and|but|or|nor|so|yet|because|although|though|while|whereas|which|then)\b)",
+    flags=re.IGNORECASE,
+)
+
+_WORD_BOUNDARY_PATTERN = re.compile(r"\s+")
+
+# Real-time factor assumed for chunk growth before one has been measured
+_DEFAULT_GROWTH_RTF = 0.5
+
+
+def chunk_limit(
+    emitted_chars: int,
+    previous_limit: int,
+    max_chunk_length: int,
+    first_chunk_length: Optional[int] = None,
+    rtf: Optional[float] = None,
+) -> int:
+    """
+    Length limit for the next chunk.
+
+    With no ``first_chunk_length`` every chunk may use ``max_chunk_length``.
+    Otherwise the first chunk is kept short for a fast time-to-first-audio,
+    and each later chunk may grow to what can be synthesized before the audio
+    still buffered runs out. Producing ``emitted_chars`` of audio took ``rtf``
+    of its duration (RTF = inference seconds / audio seconds), so roughly
+    ``emitted_chars * (1 - rtf)`` is still unplayed and buys
+    ``emitted_chars * (1 - rtf) / rtf`` characters of synthesis. Growth is
+    at most doubling per chunk and capped at ``max_chunk_length``; at
+    RTF >= 1 chunks stay at ``first_chunk_length``.
+    """
+    if not first_chunk_length or first_chunk_length >= max_chunk_length:
+        return max_chunk_length
+    if emitted_chars == 0:
+        return first_chunk_length
+    rtf = min(max(rtf if rtf is not None else _DEFAULT_GROWTH_RTF, 0.05), 1.0)
+    ahead = emitted_chars * (1 - rtf) / rtf
+    limit = min(ahead, previous_limit * 2, max_chunk_length)
+    return int(max(first_chunk_length, limit))
+
+
+def _last_boundary(pattern: re.Pattern, text: str, limit: int) -> Optional[re.Match]:
+    """Last match of pattern that starts within limit (and not at position 0)."""
+    best = None
+    for match in pattern.finditer(text):
+        if match.start() > limit:
+            break
+        if match.start() > 0:
+            best = match
+    return best
+
+
+def _split_soft(sentence: str, limit: int) -> Tuple[str, str]:
+    """Split a sentence at its last clause, else conjunction, boundary within limit.
+
+    Returns ("", sentence) if there is no such boundary.
+    """
+    for pattern in (_CLAUSE_PATTERN, _CONJUNCTION_PATTERN):
+        match = _last_boundary(pattern, sentence, limit)
+        if match:
+            return sentence[:match.start()], sentence[match.end():]
+    return "", sentence
+
+
+def _split_hard(sentence: str, limit: int) -> Tuple[str, str]:
+    """Split a sentence so the head is at most limit characters, whatever it contains.
+
+    Prefers a clause or conjunction boundary in the second half of the limit,
+    then the last word boundary, and cuts mid-word only as a last resort.
+    """
+    for pattern in (_CLAUSE_PATTERN, _CONJUNCTION_PATTERN):
+        match = _last_boundary(pattern, sentence, limit)
+        if match and match.start() >= limit // 2:
+            return sentence[:match.start()], sentence[match.end():]
+    match = _last_boundary(_WORD_BOUNDARY_PATTERN, sentence, limit)
+    if match:
+        return sentence[:match.start()], sentence[match.end():]
+    return sentence[:limit], sentence[limit:]
+
+
+class _ChunkSizer:
+    """Tracks the text emitted so far to size each next chunk (see chunk_limit)."""
+
+    def __init__(
+        self,
+        max_chunk_length: int,
+        first_chunk_length: Optional[int] = None,
+        rtf: Optional[float] = None,
+    ):
+        self.max_chunk_length = max_chunk_length
+        self.first_chunk_length = first_chunk_length
+        self.rtf = rtf
+        self.emitted_chars = 0
+        self.limit = chunk_limit(0, 0, max_chunk_length, first_chunk_length, rtf)
+
+    def emitted(self, chunk: str):
+        self.emitted_chars += len(chunk)
+        self.limit = chunk_limit(
+            self.emitted_chars, self.limit, self.max_chunk_length, self.first_chunk_length, self.rtf
+        )
+
+
+def _split_over_limit(sentence: str, sizer: _ChunkSizer) -> Tuple[List[str], str]:
+    """Cut leading chunks off a sentence that does not fit the current limit.
+
+    Sentences longer than max_chunk_length are always split (at clauses,
+    conjunctions, then words); while adaptive chunks are still small, shorter
+    ones are split only at clauses and conjunctions.
+    Returns the chunks cut off and the remaining text.
     """
+    heads = []
+    while len(sentence) > sizer.limit:
+        if len(sentence) > sizer.max_chunk_length:
+            head, tail = _split_hard(sentence, sizer.limit)
+        else:
+            head, tail = _split_soft(sentence, sizer.limit)
+            if not head:
+                break
+        head = head.strip()
+        heads.append(head)
+        sizer.emitted(head)
+        sentence = tail.strip()
+    return heads, sentence
+
+
+def _split_text(text: str, sizer: _ChunkSizer) -> Iterator[Tuple[str, List[int], Optional[float]]]:
+    """Split complete text into chunks and pauses, sized by sizer."""
     # Split by pause tags first
     parts = _PAUSE_TAG_PATTERN.split(text)
-    
+
     for i, part in enumerate(parts):
         # Every odd index is a pause duration
         if i % 2 == 1:
@@ -134,35 +269,132 @@ async def smart_split(
             except ValueError:
                 continue
             continue
-            
+
         if not part.strip():
             continue
 
         # Split by paragraph
         paragraphs = _PARAGRAPH_PATTERN.split(part.strip())
-        
+
         for paragraph in paragraphs:
             paragraph = paragraph.strip()
             if not paragraph:
                 continue
-                
+
             # Split by sentence boundaries
             sentences = _SENTENCE_PATTERN.split(paragraph)
-            
+
             # Combine sentences into chunks
             current_chunk = ""
-            
+
             for sentence in sentences:
                 sentence = sentence.strip()
                 if not sentence:
                     continue
-                    
-                if len(current_chunk) + len(sentence) + 1 <= max_chunk_length:
+
+                if len(current_chunk) + len(sentence) + 1 <= sizer.limit:
                     current_chunk += (" " if current_chunk else "") + sentence
-                else:
-                    if current_chunk:
-                        yield current_chunk.strip(), [], None
-                    current_chunk = sentence
-            
+                    continue
+
+                if current_chunk:
+                    yield current_chunk.strip(), [], None
+                    sizer.emitted(current_chunk)
+
+                heads, current_chunk = _split_over_limit(sentence, sizer)
+                for head in heads:
+                    yield head, [], None
+
             if current_chunk:
                 yield current_chunk.strip(), [], None
+                sizer.emitted(current_chunk)
+
+
+async def smart_split(
+    text: str,
+    max_chunk_length: int = 300,
+    first_chunk_length: Optional[int] = None,
+    rtf: Optional[float] = None,
+) -> AsyncGenerator[Tuple[str, List[int], Optional[float]], None]:
+    """
+    Split text into chunks by paragraphs and sentences.
+    Yields: (chunk_text, tokens, pause_duration_s)
+
+    Sentences are packed greedily into chunks of up to ``max_chunk_length``,
+    which is a hard bound: sentences longer than that (run-on transcripts,
+    lists, unpunctuated text) are split at clauses, conjunctions, and
+    finally word boundaries.
+    Passing ``first_chunk_length`` enables adaptive sizing: the first chunk
+    is at most that long (cut at a clause boundary if the first sentence is
+    longer) and later chunks grow with the real-time factor ``rtf`` as
+    described in ``chunk_limit``.
+
+    Note: tokens are always empty list (kept for API compatibility)
+    """
+    for item in _split_text(text, _ChunkSizer(max_chunk_length, first_chunk_length, rtf)):
+        yield item
+
+
+# Characters re-examined before newly arrived text, so boundaries that span
+# fragments (whitespace runs, paragraph breaks, pause tags) are still found
+_STREAM_LOOKBACK = 32
+
+
+def _last_confirmed_boundary(buffer: str, start: int) -> int:
+    """End of the text before the last boundary found at or after start, or 0.
+
+    A sentence end only counts once the whitespace after it has arrived, so
+    "Dr." or "3." followed by more text later is never cut early.
+    """
+    boundary = 0
+    for match in _SENTENCE_PATTERN.finditer(buffer, start):
+        boundary = max(boundary, match.start())
+    for match in _PARAGRAPH_PATTERN.finditer(buffer, start):
+        boundary = max(boundary, match.start())
+    for match in _PAUSE_TAG_PATTERN.finditer(buffer, start):
+        boundary = max(boundary, match.end())
+    return boundary
+
+
+async def smart_split_stream(
+    fragments: AsyncIterable[str],
+    max_chunk_length: int = 300,
+    first_chunk_length: Optional[int] = None,
+    rtf: Optional[float] = None,
+) -> AsyncGenerator[Tuple[str, List[int], Optional[float]], None]:
+    """
+    Incremental smart_split over text that arrives in fragments (e.g. LLM tokens).
+    Yields: (chunk_text, tokens, pause_duration_s)
+
+    Text up to the last confirmed sentence end, paragraph break or pause tag
+    is split as soon as it arrives, with the same rules and chunk sizing as
+    ``smart_split``. Text without a boundary is held until it exceeds the
+    current chunk limit, then cut at a clause, conjunction or word boundary.
+    Each fragment is scanned once (plus a short look-back), not the whole
+    buffer.
+    """
+    sizer = _ChunkSizer(max_chunk_length, first_chunk_length, rtf)
+    buffer = ""
+    async for fragment in fragments:
+        if not fragment:
+            continue
+        scan_from = max(0, len(buffer) - _STREAM_LOOKBACK)
+        buffer += fragment
+
+        boundary = _last_confirmed_boundary(buffer, scan_from)
+        if boundary:
+            for item in _split_text(buffer[:boundary], sizer):
+                yield item
+            buffer = buffer[boundary:].lstrip()
+
+        # No boundary in sight: do not let the pending text outgrow a chunk
+        # (unless a pause tag may be arriving)
+        if len(buffer) > sizer.limit and "[" not in buffer[-_STREAM_LOOKBACK:]:
+            heads, remainder = _split_over_limit(buffer.strip(), sizer)
+            for head in heads:
+                yield head, [], None
+            if heads:
+                # Keep the trailing space so the next fragment starts a new word
+                buffer = remainder + buffer[len(buffer.rstrip()):]
+
+    for item in _split_text(buffer, sizer):
+        yield item
@@ -0,0 +1,150 @@
+"""
+Length-bucketed vs FIFO micro-batching benchmark.
+
+Feeds a realistic mix of chunk lengths (as produced by smart_split) through
+BatchScheduler three times: unbatched (batch size 1), plain FIFO batches
+(no buckets) and length-bucketed batches. Inference cost is simulated as
+proportional to the padded batch (longest chunk x batch size), which is
+how a batched ONNX call behaves.
+Pass --real to run the batches through the loaded Supertonic model instead;
+padding is then also reported from the predicted audio durations, which is
+what the batched model call actually computes.
+
+    python3 tests/benchmark/batching_benchmark.py [--real]
+"""
+import asyncio
+import random
+import statistics
+import sys
+import time
+
+sys.path.insert(0, ".")
+
+from app.core.config import settings  # noqa: E402
+from app.core.metrics import metrics  # noqa: E402
+from app.services.batching import BatchScheduler  # noqa: E402
+
+CHUNKS = 400
+CONCURRENCY = 32
+MAX_BATCH_SIZE = 8
+MAX_WAIT_MS = 5.0
+BUCKET_EDGES = [40, 100, 200]
+
+# Simulated cost model (seconds), with WORKERS batches running at once
+WORKERS = 4
+BATCH_OVERHEAD_S = 0.002
+COST_PER_PADDED_CHAR_S = 0.00002
+
+WORDS = (
+    "the quick brown fox jumps over a lazy dog while our service reads "
+    "menus notifications disclaimers and long paragraphs of narrative text"
+).split()
+
+
+def realistic_lengths(n: int) -> list:
+    """Mix of short UI strings, typical sentences and full 300-char chunks."""
+    lengths = []
+    for _ in range(n):
+        r = random.random()
+        if r < 0.35:
+            lengths.append(random.randint(8, 40))
+        elif r < 0.75:
+            lengths.append(random.randint(40, 160))
+        else:
+            lengths.append(random.randint(160, 300))
+    return lengths
+
+
+def make_text(length: int) -> str:
+    text = ""
+    while len(text) < length:
+        text += random.choice(WORDS) + " "
+    return text[:length].strip() + "."
+
+
+_worker_slots = None
+
+
+async def simulated_runner(key, texts, context):
+    global _worker_slots
+    if _worker_slots is None:
+        _worker_slots = asyncio.Semaphore(WORKERS)
+    longest = max(len(t) for t in texts)
+    async with _worker_slots:
+        await asyncio.sleep(BATCH_OVERHEAD_S + COST_PER_PADDED_CHAR_S * longest * len(texts))
+    return [len(t) for t in texts]
+
+
+def real_runner():
+    from app.services.tts import tts_service
+
+    model = tts_service._ensure_model_loaded()
+    style = tts_service.get_style("alloy")
+
+    async def runner(key, texts, context):
+        return await tts_service._run_batch(key, texts, (model, style))
+
+    return runner
+
+
+async def run(label: str, texts: list, runner, bucket_edges, max_batch_size: int = MAX_BATCH_SIZE) -> dict:
+    metrics.__init__()
+    scheduler = BatchScheduler(
+        runner,
+        max_batch_size=max_batch_size,
+        max_wait_ms=MAX_WAIT_MS,
+        bucket_edges=bucket_edges,
+    )
+    semaphore = asyncio.Semaphore(CONCURRENCY)
+    latencies = []
+
+    async def one(text):
+        async with semaphore:
+            start = time.perf_counter()
+            await scheduler.submit(("v1", "alloy", 1.0, settings.DENOISING_STEPS), text)
+            latencies.append(time.perf_counter() - start)
+
+    start = time.perf_counter()
+    await asyncio.gather(*[one(t) for t in texts])
+    duration = time.perf_counter() - start
+
+    summaries = metrics.snapshot()["summaries"]
+    return {
+        "label": label,
+        "duration": duration,
+        "throughput": len(texts) / duration,
+        "p50": statistics.median(latencies),
+        "p95": statistics.quantiles(latencies, n=20)[18],
+        "batch_size": summaries["batch_size"]["avg"],
+        "padding": summaries.get("batch_padding_ratio", {}).get("avg", 0.0),
+        "audio_padding": summaries.get("batch_audio_padding_ratio", {}).get("avg"),
+    }
+
+
+async def main():
+    random.seed(42)
+    texts = [make_text(n) for n in realistic_lengths(CHUNKS)]
+    runner = real_runner() if "--real" in sys.argv else simulated_runner
+
+    results = [
+        await run("Unbatched", texts, runner, [], max_batch_size=1),
+        await run("FIFO", texts, runner, []),
+        await run("Bucketed", texts, runner, BUCKET_EDGES),
+    ]
+
+    print(f"{CHUNKS} chunks, concurrency {CONCURRENCY}, max batch {MAX_BATCH_SIZE}, max wait {MAX_WAIT_MS}ms")
+    print(
+        f"{'Mode':<10} {'Time':>8} {'Chunks/s':>9} {'P50':>8} {'P95':>8} {'Batch':>6} "
+        f"{'Padding':>8} {'Audio pad':>10}"
+    )
+    for r in results:
+        audio_padding = "-" if r["audio_padding"] is None else f"{r['audio_padding']:.1%}"
+        print(
+            f"{r['label']:<10} {r['duration']:7.2f}s {r['throughput']:9.1f} "
+            f"{r['p50']*1000:6.1f}ms {r['p95']*1000:6.1f}ms {r['batch_size']:6.2f} "
+            f"{r['padding']:7.1%} {audio_padding:>10}"
+        )
+
+
+if __name__ == "__main__":
+    asyncio.run(main())
@@ -0,0 +1,99 @@
+"""
+INT8 vs FP32 benchmark: speed, memory and audio similarity, CPU only.
+
+Loads the FP32 model and its INT8-quantized variant ("-int8" model
+version; quantized files are produced on first load), synthesizes a fixed
+text set with both and reports:
+  RTF         median inference seconds / audio seconds
+  RSS         resident memory added by loading the version
+  similarity  mean cosine similarity of log-magnitude spectrogram frames
+              against FP32 (1.0 = identical), and the duration ratio
+Both runs use the same random seed per sentence. The FP32 row compares a
+second FP32 run, which is the ceiling to judge the INT8 score against.
+
+    python3 tests/benchmark/int8_benchmark.py [version]   # default: DEFAULT_MODEL_VERSION
+"""
+import os
+import statistics
+import sys
+import time
+
+sys.path.insert(0, ".")
+os.environ.setdefault("FORCE_PROVIDERS", "cpu")
+
+import numpy as np  # noqa: E402
+from scipy.signal import stft  # noqa: E402
+
+from app.core.config import settings  # noqa: E402
+from app.services.ort_session import INT8_SUFFIX  # noqa: E402
+from app.services.registry import _rss_mb  # noqa: E402
+from app.services.tts import tts_service  # noqa: E402
+
+SENTENCES = [
+    "Your order has shipped and should arrive on Thursday.",
+    "The meeting was moved to three thirty, in the small conference room on the second floor.",
+    "Once upon a time, in a small village by the sea, there lived an old fisherman who went out every morning before dawn.",
+    "Please hold while we connect you.",
+    "Temperatures will drop sharply overnight, so remember to cover sensitive plants and bring pets indoors.",
+    "Is this the right number for the billing department, or should I call back later?",
+]
+VOICE = "alloy"
+SEED = 1234
+
+
+def log_spectrogram(wav: np.ndarray, sample_rate: int) -> np.ndarray:
+    _, _, spec = stft(wav, fs=sample_rate, nperseg=1024, noverlap=768)
+    return np.log(np.abs(spec) + 1e-5).T  # frames x bins
+
+
+def similarity(reference: np.ndarray, candidate: np.ndarray, sample_rate: int) -> float:
+    a = log_spectrogram(reference, sample_rate)
+    b = log_spectrogram(candidate, sample_rate)
+    frames = min(len(a), len(b))
+    a, b = a[:frames], b[:frames]
+    cosine = np.sum(a * b, axis=1) / (np.linalg.norm(a, axis=1) * np.linalg.norm(b, axis=1) + 1e-9)
+    return float(np.mean(cosine))
+
+
+def synthesize_all(version: str):
+    model = tts_service._ensure_model_loaded(version)
+    style = tts_service.get_style(VOICE, version)
+    tts_service._infer_batch(model, SENTENCES[:1], style, 1.0, settings.DENOISING_STEPS)  # warm-up
+    wavs, rtfs = [], []
+    for i, text in enumerate(SENTENCES):
+        np.random.seed(SEED + i)
+        start = time.perf_counter()
+        wav = tts_service._infer_batch(model, [text], style, 1.0, settings.DENOISING_STEPS)[0]
+        elapsed = time.perf_counter() - start
+        wavs.append(np.asarray(wav, dtype=np.float32))
+        rtfs.append(elapsed / (len(wav) / model.sample_rate))
+    return model.sample_rate, wavs, statistics.median(rtfs)
+
+
+def load(version: str) -> float:
+    before = _rss_mb() or 0.0
+    tts_service._ensure_model_loaded(version)
+    return (_rss_mb() or 0.0) - before
+
+
+def main():
+    base = sys.argv[1] if len(sys.argv) > 1 else settings.DEFAULT_MODEL_VERSION
+    versions = [base, base + INT8_SUFFIX]
+    memory = {version: load(version) for version in versions}
+
+    sample_rate, reference, _ = synthesize_all(base)
+    _, repeat, fp32_rtf = synthesize_all(base)
+    _, quantized, int8_rtf = synthesize_all(versions[1])
+    rows = [(base, fp32_rtf, repeat), (versions[1], int8_rtf, quantized)]
+
+    print(f"{len(SENTENCES)} sentences, voice {VOICE}, {settings.DENOISING_STEPS} steps, CPU")
+    print(f"{'Version':<10} {'RTF p50':>8} {'RSS':>9} {'Similarity':>11} {'Duration':>9}")
+    for version, rtf, wavs in rows:
+        score = statistics.mean(similarity(r, c, sample_rate) for r, c in zip(reference, wavs))
+        duration = sum(len(w) for w in wavs) / sum(len(w) for w in reference)
+        print(f"{version:<10} {rtf:8.3f} {memory[version]:7.0f}MB {score:11.4f} {duration:9.3f}")
+    print(f"INT8 speed-up: {fp32_rtf / int8_rtf:.2f}x")
+
+
+if __name__ == "__main__":
+    main()
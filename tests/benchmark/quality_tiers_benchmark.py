@@ -0,0 +1,86 @@
+"""
+Quality tier benchmark: real-time factor per denoising step count.
+
+Synthesizes a fixed set of sentences through the loaded Supertonic model at
+each step count used by QUALITY_TIERS (plus a few neighbours) and reports
+the median real-time factor (inference seconds / audio seconds) and the
+median latency per sentence, so a tier can be picked for its latency budget.
+Pass --save to also write one wav per step count to tests/benchmark/tiers/
+for listening.
+
+    python3 tests/benchmark/quality_tiers_benchmark.py [--save]
+"""
+import os
+import statistics
+import sys
+import time
+import wave
+
+sys.path.insert(0, ".")
+
+import numpy as np  # noqa: E402
+
+from app.core.config import settings  # noqa: E402
+from app.services.tts import tts_service  # noqa: E402
+
+SENTENCES = [
+    "Your order has shipped and should arrive on Thursday.",
+    "The meeting was moved to three thirty, in the small conference room on the second floor.",
+    "Once upon a time, in a small village by the sea, there lived an old fisherman who went out every morning before dawn.",
+    "Please hold while we connect you.",
+    "Temperatures will drop sharply overnight, so remember to cover sensitive plants and bring pets indoors.",
+]
+VOICE = "alloy"
+RUNS = 3
+OUTPUT_DIR = "tests/benchmark/tiers"
+
+
+def tiers_for(steps: int) -> str:
+    names = [name for name, value in settings.QUALITY_TIERS.items() if value == steps]
+    if steps == settings.DENOISING_STEPS:
+        names.append("default")
+    return ", ".join(names)
+
+
+def save_wav(path: str, audio: np.ndarray, sample_rate: int):
+    pcm = (np.clip(audio, -1.0, 1.0) * 32767).astype(np.int16)
+    with wave.open(path, "wb") as f:
+        f.setnchannels(1)
+        f.setsampwidth(2)
+        f.setframerate(sample_rate)
+        f.writeframes(pcm.tobytes())
+
+
+def main():
+    save = "--save" in sys.argv
+    model = tts_service._ensure_model_loaded()
+    style = tts_service.get_style(VOICE)
+    step_counts = sorted({2, settings.DENOISING_STEPS, *settings.QUALITY_TIERS.values()})
+
+    # Warm up so the first measured step count does not pay for session start-up
+    tts_service._infer_batch(model, SENTENCES[:1], style, 1.0, settings.DENOISING_STEPS)
+
+    if save:
+        os.makedirs(OUTPUT_DIR, exist_ok=True)
+    print(f"{len(SENTENCES)} sentences x {RUNS} runs, voice {VOICE}")
+    print(f"{'Steps':>5} {'RTF p50':>8} {'ms/sentence':>12}  Tiers")
+    for steps in step_counts:
+        rtfs = []
+        latencies = []
+        for run in range(RUNS):
+            for i, text in enumerate(SENTENCES):
+                start = time.perf_counter()
+                wav = tts_service._infer_batch(model, [text], style, 1.0, steps)[0]
+                elapsed = time.perf_counter() - start
+                rtfs.append(elapsed / (len(wav) / model.sample_rate))
+                latencies.append(elapsed * 1000)
+                if save and run == 0 and i == len(SENTENCES) - 1:
+                    save_wav(os.path.join(OUTPUT_DIR, f"steps_{steps:02d}.wav"), wav, model.sample_rate)
+        print(
+            f"{steps:5d} {statistics.median(rtfs):8.3f} {statistics.median(latencies):10.0f}ms  "
+            f"{tiers_for(steps)}"
+        )
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,75 @@
+"""
+Cold start benchmark: model load and first inference, CPU only.
+
+Each scenario runs in a fresh interpreter so nothing is shared in memory:
+  no-cache   optimized graph cache off (ORT_OPTIMIZED_MODEL_DIR="")
+  cold       empty cache directory; graphs are optimized and saved
+  warm       same directory again; saved graphs are loaded as-is
+Reports model load time and first-inference latency per scenario, the
+median of several runs (the cold scenario starts from an empty directory
+every run).
+
+    python3 tests/benchmark/startup_benchmark.py [runs]
+"""
+import json
+import os
+import shutil
+import statistics
+import subprocess
+import sys
+import tempfile
+
+RUNS = int(sys.argv[1]) if len(sys.argv) > 1 else 3
+
+CHILD = """
+import json, sys, time
+sys.path.insert(0, ".")
+start = time.perf_counter()
+from app.services.tts import tts_service
+imported = time.perf_counter()
+model = tts_service._ensure_model_loaded()
+loaded = time.perf_counter()
+style = tts_service.get_style("alloy")
+from app.core.config import settings
+tts_service._infer_batch(model, ["The quick brown fox jumps over the lazy dog."], style, 1.0, settings.DENOISING_STEPS)
+first = time.perf_counter()
+print(json.dumps({"import": imported - start, "load": loaded - imported, "first": first - loaded}))
+"""
+
+
+def run_child(cache_dir: str) -> dict:
+    env = dict(
+        os.environ,
+        FORCE_PROVIDERS="cpu",
+        ORT_OPTIMIZED_MODEL_DIR=cache_dir,
+        PRELOAD_MODEL_VERSIONS="[]",
+        PCM_CACHE_MB="0",
+    )
+    out = subprocess.run(
+        [sys.executable, "-c", CHILD], env=env, capture_output=True, text=True, check=True
+    ).stdout
+    return json.loads(out.strip().splitlines()[-1])
+
+
+def main():
+    cache_dir = tempfile.mkdtemp(prefix="ort-cache-")
+    results = {"no-cache": [], "cold": [], "warm": []}
+    try:
+        for _ in range(RUNS):
+            results["no-cache"].append(run_child(""))
+            shutil.rmtree(cache_dir, ignore_errors=True)
+            results["cold"].append(run_child(cache_dir))
+            results["warm"].append(run_child(cache_dir))
+    finally:
+        shutil.rmtree(cache_dir, ignore_errors=True)
+
+    print(f"median of {RUNS} runs, CPU provider")
+    print(f"{'Scenario':<9} {'Load':>8} {'First inference':>16}")
+    for name, runs in results.items():
+        load = statistics.median(r["load"] for r in runs)
+        first = statistics.median(r["first"] for r in runs)
+        print(f"{name:<9} {load*1000:6.0f}ms {first*1000:14.0f}ms")
+
+
+if __name__ == "__main__":
+    main()
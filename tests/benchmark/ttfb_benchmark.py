@@ -0,0 +1,102 @@
+"""
+Time-to-first-audio benchmark: fixed vs adaptive chunking.
+
+Splits a long passage with smart_split under both policies and plays the
+chunks back against a simulated model (inference time = overhead + audio
+seconds x RTF, one chunk at a time). Reports time to first audio, total
+playback stall (gaps where the next chunk was not ready) and chunk count
+for a range of real-time factors.
+Pass --real to stream through the loaded Supertonic model instead and
+measure time to the first encoded bytes and total time per policy.
+
+    python3 tests/benchmark/ttfb_benchmark.py [--real]
+"""
+import asyncio
+import sys
+import time
+
+sys.path.insert(0, ".")
+
+from app.core.config import settings  # noqa: E402
+from app.utils.text import smart_split  # noqa: E402
+
+PASSAGE = (
+    "Once upon a time, in a small village by the sea, there lived an old fisherman "
+    "who went out every morning before dawn. He knew every rock and current of the bay. "
+    "The villagers trusted him, and when storms came they asked him where the fish would be. "
+    "Years passed and his hands grew slow, but his eyes stayed sharp; he could still read "
+    "the sky better than anyone. One winter a stranger arrived with charts and instruments, "
+    "promising catches twice as large. Nobody listened to the old man's warnings that year. "
+) * 4
+
+# Simulated cost model
+CHARS_PER_AUDIO_SECOND = 15.0
+CHUNK_OVERHEAD_S = 0.05
+RTFS = (0.1, 0.3, 0.6)
+
+
+async def split(policy: str, rtf: float) -> list:
+    first = settings.FIRST_CHUNK_LENGTH if policy == "adaptive" else None
+    return [
+        chunk
+        async for chunk, _, pause in smart_split(PASSAGE, settings.MAX_CHUNK_LENGTH, first, rtf)
+        if chunk
+    ]
+
+
+def simulate(chunks: list, rtf: float) -> dict:
+    """Sequential inference; playback starts with the first chunk and stalls when starved."""
+    ready = 0.0
+    play_end = None
+    stall = 0.0
+    ttfa = None
+    for chunk in chunks:
+        audio_s = len(chunk) / CHARS_PER_AUDIO_SECOND
+        ready += CHUNK_OVERHEAD_S + audio_s * rtf
+        if play_end is None:
+            ttfa = ready
+            play_end = ready
+        elif ready > play_end:
+            stall += ready - play_end
+            play_end = ready
+        play_end += audio_s
+    return {"ttfa": ttfa, "stall": stall, "chunks": len(chunks), "first": len(chunks[0])}
+
+
+async def run_simulated():
+    print(f"{len(PASSAGE)} chars, max chunk {settings.MAX_CHUNK_LENGTH}, first chunk {settings.FIRST_CHUNK_LENGTH}")
+    print(f"{'RTF':>5} {'Policy':<9} {'TTFA':>8} {'Stall':>8} {'Chunks':>7} {'First':>6}")
+    for rtf in RTFS:
+        for policy in ("fixed", "adaptive"):
+            r = simulate(await split(policy, rtf), rtf)
+            print(
+                f"{rtf:5.2f} {policy:<9} {r['ttfa']*1000:6.0f}ms {r['stall']*1000:6.0f}ms "
+                f"{r['chunks']:7d} {r['first']:6d}"
+            )
+
+
+async def run_real():
+    from app.services.streaming_audio_writer import StreamingAudioWriter
+    from app.services.tts import tts_service
+
+    model = tts_service._ensure_model_loaded()
+    # Warm up so the first measured run does not pay for session start-up
+    await tts_service.generate_audio(PASSAGE[:200], "alloy", StreamingAudioWriter("pcm", model.sample_rate), output_format="pcm")
+
+    print(f"{'Policy':<9} {'TTFB':>8} {'Total':>8}")
+    for policy in ("fixed", "adaptive"):
+        writer = StreamingAudioWriter("pcm", model.sample_rate)
+        start = time.perf_counter()
+        first = None
+        async for chunk in tts_service.generate_audio_stream(
+            PASSAGE, "alloy", writer, output_format="pcm", chunking=policy
+        ):
+            if first is None and chunk.output:
+                first = time.perf_counter() - start
+        total = time.perf_counter() - start
+        writer.close()
+        print(f"{policy:<9} {first*1000:6.0f}ms {total*1000:6.0f}ms")
+
+
+if __name__ == "__main__":
+    asyncio.run(run_real() if "--real" in sys.argv else run_simulated())
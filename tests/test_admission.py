@@ -0,0 +1,57 @@
+"""
+Unit tests for admission tickets held by streaming responses.
+
+    python3 -m pytest tests/test_admission.py
+"""
+import asyncio
+import sys
+
+import pytest
+
+sys.path.insert(0, ".")
+
+from app.api.routes import _AdmittedStreamingResponse  # noqa: E402
+from app.services.admission import admission  # noqa: E402
+
+pytestmark = pytest.mark.skipif(admission is None, reason="ADMISSION_ENABLED is off")
+
+
+def stream_to_gone_client(spec_version: str):
+    """Send a streaming response to a client that hung up before the first byte."""
+    started = []
+
+    async def body():
+        started.append(True)
+        yield b"audio"
+
+    async def receive():
+        return {"type": "http.disconnect"}
+
+    async def send(message):
+        raise OSError("client went away")
+
+    ticket = admission.reserve(1.0)
+    response = _AdmittedStreamingResponse(body(), ticket=ticket)
+    scope = {"type": "http", "asgi": {"spec_version": spec_version}}
+    try:
+        asyncio.run(response(scope, receive, send))
+    except Exception:
+        pass
+    return ticket, started
+
+
+def test_ticket_released_when_body_never_iterated():
+    before = admission.outstanding_s
+    ticket, started = stream_to_gone_client("2.4")
+
+    assert not started
+    assert ticket.cost_s == 0.0
+    assert admission.outstanding_s == before
+
+
+def test_ticket_released_on_disconnect_without_asgi_2_4():
+    before = admission.outstanding_s
+    ticket, _ = stream_to_gone_client("2.0")
+
+    assert ticket.cost_s == 0.0
+    assert admission.outstanding_s == before
@@ -0,0 +1,45 @@
+"""
+Unit tests for the text splitters.
+
+    python3 -m pytest tests/test_text.py
+"""
+import asyncio
+import sys
+
+sys.path.insert(0, ".")
+
+from app.utils.text import clean_fragment, smart_split_stream  # noqa: E402
+
+# No sentence end, so the stream splitter has to cut at word boundaries
+TEXT = (
+    "the incremental splitter with fragments that end in spaces keeps "
+    "going somewhere eventually and only and then some more words follow "
+    "here without any punctuation at all for quite a long while"
+)
+
+
+def split_stream(fragments, **kwargs):
+    async def source():
+        for fragment in fragments:
+            yield fragment
+
+    async def collect():
+        return [chunk async for chunk, _, _ in smart_split_stream(source(), **kwargs)]
+
+    return asyncio.run(collect())
+
+
+def test_stream_split_keeps_words_of_space_terminated_fragments_apart():
+    # Token streams send each word with its trailing space; clean_fragment keeps it
+    fragments = [clean_fragment(word + " ") for word in TEXT.split()]
+    chunks = split_stream(fragments, max_chunk_length=40, first_chunk_length=40)
+
+    assert len(chunks) > 1
+    assert " ".join(chunks).split() == TEXT.split()
+    assert all(len(chunk) <= 40 for chunk in chunks)
+
+
+def test_stream_split_matches_whole_text_words():
+    chunks = split_stream([TEXT[i:i + 7] for i in range(0, len(TEXT), 7)], max_chunk_length=40)
+
+    assert " ".join(chunks).split() == TEXT.split()